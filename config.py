@@ -1,14 +1,21 @@
 """
 Configuration settings for the Multi-Agent Educational Platform
 """
+import atexit
+import logging
 import os
+import queue
+from functools import lru_cache
+from logging.handlers import QueueListener
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 # Base paths
 PROJECT_ROOT = Path(__file__).parent
 DATA_DIR = PROJECT_ROOT / "data"
 LOGS_DIR = PROJECT_ROOT / "logs"
+_LOG_FILE = str(LOGS_DIR / "platform.log")
 
 # Database configuration
 OBJECTBOX_CONFIG = {
@@ -38,12 +45,28 @@ ANALYTICS_CONFIG = {
     "batch_size": 100,
 }
 
+# HTTP server configuration (gunicorn settings). Requests spend most of their
+# time waiting on model calls, so each worker process serves several threads.
+# Conversation sessions live in the worker's memory, so a single worker keeps
+# every turn of a session on the same process; scale with threads until
+# sessions move to a shared store.
+SERVER_CONFIG = {
+    "bind": "0.0.0.0:8000",
+    "workers": 1,
+    "worker_class": "gthread",
+    "threads": 8,
+    "timeout": 120,  # seconds; agent runs can take a while
+}
+
 # External API configuration
 GOOGLE_CALENDAR_CONFIG = {
     "scopes": ["https://www.googleapis.com/auth/calendar"],
     "credentials_file": str(PROJECT_ROOT / "credentials" / "google_credentials.json"),
 }
 
+# Log records handed from the "file" QueueHandler to the background file writer
+LOG_QUEUE: queue.Queue = queue.Queue(-1)
+
 # Logging configuration
 LOGGING_CONFIG = {
     "version": 1,
@@ -61,10 +84,8 @@ LOGGING_CONFIG = {
         },
         "file": {
             "level": "DEBUG",
-            "formatter": "standard",
-            "class": "logging.FileHandler",
-            "filename": str(LOGS_DIR / "platform.log"),
-            "mode": "a",
+            "class": "logging.handlers.QueueHandler",
+            "queue": LOG_QUEUE,
         },
     },
     "loggers": {
@@ -76,19 +97,53 @@ LOGGING_CONFIG = {
     }
 }
 
-def get_config() -> Dict[str, Any]:
-    """Get the complete configuration dictionary"""
-    return {
-        "objectbox": OBJECTBOX_CONFIG,
-        "pocketflow": POCKETFLOW_CONFIG,
-        "mcp": MCP_CONFIG,
-        "analytics": ANALYTICS_CONFIG,
-        "google_calendar": GOOGLE_CALENDAR_CONFIG,
-        "logging": LOGGING_CONFIG,
-    }
+@lru_cache(maxsize=1)
+def get_config() -> Mapping[str, Any]:
+    """
+    Get the complete configuration mapping
+
+    The result is built once and cached; it is returned as a read-only view
+    so callers sharing the cached object cannot mutate it for each other.
+    Required directories are created first, so the paths it refers to exist
+    before the config is used. (The log file itself is opened by
+    start_log_listener; the logging config only holds a QueueHandler.)
+    """
+    ensure_directories()
+    return MappingProxyType({
+        "objectbox": MappingProxyType(OBJECTBOX_CONFIG),
+        "pocketflow": MappingProxyType(POCKETFLOW_CONFIG),
+        "mcp": MappingProxyType(MCP_CONFIG),
+        "analytics": MappingProxyType(ANALYTICS_CONFIG),
+        "google_calendar": MappingProxyType(GOOGLE_CALENDAR_CONFIG),
+        "server": MappingProxyType(SERVER_CONFIG),
+        "logging": MappingProxyType(LOGGING_CONFIG),
+    })
+
+@lru_cache(maxsize=1)
+def start_log_listener() -> QueueListener:
+    """
+    Start the background thread that writes queued log records to the log file
+
+    The "file" handler in LOGGING_CONFIG only enqueues records, so logging calls
+    never block the caller (e.g. the event loop) on disk I/O.
+    """
+    ensure_directories()
+    file_handler = logging.FileHandler(_LOG_FILE, mode="a")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["formatters"]["standard"]["format"]))
+    listener = QueueListener(LOG_QUEUE, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+_dirs_ready = False
 
 def ensure_directories():
-    """Ensure required directories exist"""
+    """Ensure required directories exist (only touches the filesystem once per process)"""
+    global _dirs_ready
+    if _dirs_ready:
+        return
     DATA_DIR.mkdir(exist_ok=True)
     LOGS_DIR.mkdir(exist_ok=True)
-    (PROJECT_ROOT / "credentials").mkdir(exist_ok=True)
\ No newline at end of file
+    (PROJECT_ROOT / "credentials").mkdir(exist_ok=True)
+    _dirs_ready = True
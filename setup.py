@@ -1,10 +1,19 @@
+import os
+import re
+import sys
 from setuptools import setup, find_packages
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+# The long description only matters for published distributions; skip
+# reading README.md for local/editable installs
+if os.environ.get("BUILD_SDIST") or "sdist" in sys.argv or "bdist_wheel" in sys.argv:
+    with open("README.md", "r", encoding="utf-8") as fh:
+        long_description = fh.read()
+else:
+    long_description = ""
 
+# One regex pass over the file: every non-blank, non-comment line, stripped
 with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+    requirements = re.findall(r"(?m)^[ \t]*([^#\s][^\n]*?)[ \t\r]*$", fh.read())
 
 setup(
     name="multi-agent-educational-platform",
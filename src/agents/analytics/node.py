@@ -1,10 +1,120 @@
 import pocketflow as pf
-from pathlib import Path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils import call_llm,check_code
 import json
-from typing import Dict
+import os
+import string
+import textwrap
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# orjson parses LLM responses considerably faster; fall back to the stdlib
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+_loads = _json.loads
+
+# Static prompt scaffolding, dedented once so indentation is not sent to the
+# LLM as tokens; only the per-request fields are substituted
+_DB_PROMPT_TEMPLATE = string.Template(textwrap.dedent("""\
+    You are an expert API that exclusively translates natural language requests into ObjectBox queries for the Python SDK.
+
+    Given the database schema, convert the user's request into a valid ObjectBox query.
+    Your output MUST be a single JSON object and nothing else. Do not add explanations or markdown formatting.
+
+    Input:
+    NATURAL LANGUAGE QUERY: ${query}
+    CONTEXT: ${context}
+    DATABASE SCHEMA: ${database_schema}
+
+    TASK:
+    Translate the natural language request into an ObjectBox query for the Python SDK. The query should assume a Box instance is available as `box`.
+
+    OUTPUT FORMAT (JSON only):
+    ${output_format}
+""").strip())
+
+_ACTION_PROMPT_TEMPLATE = string.Template(textwrap.dedent("""\
+    You are an Analytics Agent designed to provide data analytics capabilities through natural language processing. Your primary function is to interpret user queries and determine the most appropriate action to fulfill their analytical needs.
+
+    **Available Actions:**
+    1. "db" - Query and display database information based on the user's question
+    2. "graph" - Generate and display visualizations/graphs based on the user's analytical request
+    3. "upload" - Upload data into existing databases or create new databases as needed (primarily for teachers)
+
+    **Your Task:**
+    Analyze the user's natural language query and select exactly ONE of the three actions above that best addresses their request. Consider the following guidelines:
+
+    - Choose "db" when users need to see raw data, search for specific records, or want tabular information
+    - Choose "graph" when users request visualizations, trends, comparisons, or want to see data represented visually
+    - Choose "upload" when users need to add new data, create databases, or manage data storage (especially for educational contexts)
+
+    **Context:** ${context}
+
+    **User Query:** ${query}
+
+    **Output Format:**
+    You must respond with a JSON object in the following format:
+    {
+      "action": "db|graph|upload",
+      "reasoning": "Brief explanation of why this action was chosen"
+    }
+
+    **Instructions:**
+    1. Read the user's query carefully
+    2. Consider the provided context
+    3. Select the most appropriate action from: "db", "graph", or "upload"
+    4. Provide a concise reasoning for your choice
+    5. Format your response as valid JSON only
+
+    Context: This agent serves educational environments where teachers may need to manage data while students and staff require various forms of data analysis and visualization.
+""").strip())
+
+
+_ANALYTICS_ACTIONS = frozenset(("db", "graph", "upload"))
+
+
+def _is_db_response(response) -> bool:
+    """Check the parsed QueryforDB reply has the fields post() relies on"""
+    return (
+        isinstance(response, dict)
+        and isinstance(response.get("code"), str)
+        and isinstance(response.get("query"), str)
+    )
+
+
+def _is_action_response(response) -> bool:
+    """Check the parsed action reply names one of the known actions"""
+    return (
+        isinstance(response, dict)
+        and response.get("action") in _ANALYTICS_ACTIONS
+        and isinstance(response.get("reasoning", ""), str)
+    )
+
+
+@lru_cache(maxsize=512)
+def _determine_action(query: str, context: str) -> Tuple[str, str]:
+    """
+    Ask the LLM which analytics action fits the query
+
+    Results are cached on (query, context) since repeat workflows re-ask the
+    same routing question. Invalid or malformed replies raise ValueError, so
+    failures are never cached.
+
+    Returns:
+        Tuple of (action, reasoning)
+    """
+    prompt = _ACTION_PROMPT_TEMPLATE.substitute(query=query, context=context)
+    response_dict = _loads(call_llm(prompt))
+    if not _is_action_response(response_dict):
+        raise ValueError(f"Unexpected action response: {response_dict!r}")
+    return response_dict["action"], response_dict.get("reasoning", "")
+
+
+def _action_cache_disabled() -> bool:
+    return os.environ.get("SAHAYAK_DISABLE_ACTION_CACHE") == "1"
+
 
 class QueryforDB(pf.Node):
     def prep(self,shared):
@@ -15,43 +125,40 @@ class QueryforDB(pf.Node):
     def exec(self,prep_res):
         query, context, database_schema = prep_res
         # Get database query using query and context
-        prompt=f'''
-                You are an expert API that exclusively translates natural language requests into ObjectBox queries for the Python SDK.
-
-                Given the database schema, convert the user's request into a valid ObjectBox query.
-                Your output MUST be a single JSON object and nothing else. Do not add explanations or markdown formatting.
-
-                Input:
-                NATURAL LANGUAGE QUERY: {query}
-                CONTEXT: {context}
-                DATABASE SCHEMA: {database_schema}
-
-                TASK:
-                Translate the natural language request into an ObjectBox query for the Python SDK. The query should assume a Box instance is available as `box`.
-
-                OUTPUT FORMAT (JSON only):
-                {{
-                    "query": "{query}",
-                    "context": "{context}",
-                    "database_used": "ObjectBox",
-                    "code": "[Generated ObjectBox Python SDK query code here]"
-                }}'''
+        # Serialize the example output so quotes/newlines in the inputs stay valid JSON
+        output_format=json.dumps({
+            "query": query,
+            "context": context,
+            "database_used": "ObjectBox",
+            "code": "[Generated ObjectBox Python SDK query code here]",
+        }, ensure_ascii=False, default=str)
+        prompt=_DB_PROMPT_TEMPLATE.substitute(
+            query=query,
+            context=context,
+            database_schema=database_schema,
+            output_format=output_format,
+        )
 
         response_text=call_llm(prompt)
-        try:
-            response_dict = json.loads(response_text)
-        except json.JSONDecodeError:
-            print("Error: LLM did not return a valid JSON object.")
-                   # Handle the error, maybe by returning a specific error structure
-            return {"query": query, "code": "Error: Invalid JSON response from LLM"}
-
-        # Return the Python dictionary
-        return response_dict
+        # Replies that cannot be a JSON object skip the parser and its exception path
+        if response_text.lstrip().startswith("{"):
+            try:
+                response_dict = _loads(response_text)
+            except _json.JSONDecodeError:
+                response_dict = None
+            if _is_db_response(response_dict):
+                # Return the Python dictionary
+                return response_dict
+
+        print("Error: LLM did not return a valid JSON object.")
+        # Handle the error, maybe by returning a specific error structure
+        return {"query": query, "code": "Error: Invalid JSON response from LLM"}
     def post(self,shared:Dict,prep_res,exec_res:Dict):
         code=exec_res['code']
-        exec_res['tool-call']=check_code('code')
+        result=check_code(code)
+        exec_res['tool-call']=result
         shared['context'].append(exec_res)
-        return check_code(code)
+        return result
 
 
 
@@ -64,52 +171,16 @@ class AnalyticsAgentBase(pf.Node):
     def exec(self,prep_res):
         query, context = prep_res
 
-        prompt = f"""
-        You are an Analytics Agent designed to provide data analytics capabilities through natural language processing. Your primary function is to interpret user queries and determine the most appropriate action to fulfill their analytical needs.
-
-        **Available Actions:**
-        1. "db" - Query and display database information based on the user's question
-        2. "graph" - Generate and display visualizations/graphs based on the user's analytical request
-        3. "upload" - Upload data into existing databases or create new databases as needed (primarily for teachers)
-
-        **Your Task:**
-        Analyze the user's natural language query and select exactly ONE of the three actions above that best addresses their request. Consider the following guidelines:
-
-        - Choose "db" when users need to see raw data, search for specific records, or want tabular information
-        - Choose "graph" when users request visualizations, trends, comparisons, or want to see data represented visually
-        - Choose "upload" when users need to add new data, create databases, or manage data storage (especially for educational contexts)
-
-        **Context:** {context}
-
-        **User Query:** {query}
-
-        **Output Format:**
-        You must respond with a JSON object in the following format:
-        {{
-          "action": "db|graph|upload",
-          "reasoning": "Brief explanation of why this action was chosen"
-        }}
-
-        **Instructions:**
-        1. Read the user's query carefully
-        2. Consider the provided context
-        3. Select the most appropriate action from: "db", "graph", or "upload"
-        4. Provide a concise reasoning for your choice
-        5. Format your response as valid JSON only
-
-        Context: This agent serves educational environments where teachers may need to manage data while students and staff require various forms of data analysis and visualization.
-        """
-
-        response_text=call_llm(prompt)
+        determine = _determine_action.__wrapped__ if _action_cache_disabled() else _determine_action
         try:
-            response_dict = json.loads(response_text)
-        except json.JSONDecodeError:
+            action, reasoning = determine(query, str(context))
+        except ValueError:
             print("Error: LLM did not return a valid JSON object.")
                    # Handle the error, maybe by returning a specific error structure
             return {"action": " ", "resoning": "Error: Invalid JSON response from LLM"}
 
-        # Return the Python dictionary
-        return response_dict
+        # Build a fresh dictionary so post() can annotate it without touching the cache
+        return {"action": action, "reasoning": reasoning}
 
     def post(self, shared, prep_res, exec_res):
         action= exec_res["action"]
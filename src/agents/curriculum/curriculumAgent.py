@@ -1,10 +1,10 @@
 from google.adk.agents import LlmAgent
 
 class CurriculumAgent(LlmAgent):
-    def __init__(self):
+    def __init__(self, model="gemini-2.0-flash"):
         super().__init__(
             name="CurriculumAgent",
-            model="gemini-2.0-flash",
+            model=model,
             description="Handles generation/help with course curriculum.",
             instruction="Help the teacher with generating a proper course curriculum or topics necessry to teach a class here."
         )
@@ -1,43 +1,448 @@
 from langchain_objectbox.vectorstores import ObjectBox
 from langchain_community.embeddings import OllamaEmbeddings
 from langchain_community.llms import Ollama
-from langchain_community.document_loaders import (
-    WebBaseLoader, 
-    PyPDFLoader, 
-    Docx2txtLoader,
-    TextLoader,
-    CSVLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredExcelLoader
-)
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts.chat import ChatPromptTemplate
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain.chains import create_retrieval_chain
-from typing import List, Union
+from . import _ollama_pool
+from .fast_split import split_text
+from config import DATA_DIR
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+from hashlib import blake2b, sha256
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import aiohttp
+import asyncio
+import atexit
+import importlib
+import numpy as np
 import os
+import pickle
+import queue
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
+# Loader class (in langchain_community.document_loaders) for each file
+# extension supported by load_directory. Resolved lazily by _loader_class,
+# since pypdf/unstructured take seconds to import and most runs need few formats.
+FILE_LOADERS = {
+    '.pdf': 'PyPDFLoader',
+    '.docx': 'Docx2txtLoader',
+    '.txt': 'TextLoader',
+    '.csv': 'CSVLoader',
+    '.pptx': 'UnstructuredPowerPointLoader',
+    '.xlsx': 'UnstructuredExcelLoader'
+}
+
+# Ingestion pipeline sizing: documents split per batch, chunks per embed/write call
+SPLIT_BATCH_SIZE = 32
+EMBED_BATCH_SIZE = 64
+_PIPELINE_DONE = object()
+
+# Chunks retrieved per question
+RETRIEVAL_K = 5
+
+# Answers kept by the semantic query cache; least recently used are evicted
+SEMANTIC_CACHE_MAX_ENTRIES = 10000
+
+# Web loading: concurrent connections and per-request timeout (seconds)
+WEB_FETCH_CONCURRENCY = 20
+WEB_FETCH_TIMEOUT = 30
+
+# Chunking: sentence-aware separator cascade, and chunks shorter than
+# MIN_CHUNK_SIZE characters (~100 tokens) are merged into their neighbours
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+MIN_CHUNK_SIZE = 400
+CHUNK_SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", " ", ""]
+
+# Default persistence locations, under the project data directory rather than
+# the working directory
+VECTOR_STORE_PATH = str(DATA_DIR / "vector_store")
+EMBEDDING_CACHE_PATH = str(DATA_DIR / "embedding_cache.sqlite3")
+
+
+@cache
+def _loader_class(name: str) -> type:
+    """Import a document loader class on first use."""
+    return getattr(importlib.import_module("langchain_community.document_loaders"), name)
+
+
+def _load_group(suffix_paths: Tuple[str, List[str]]) -> List[Document]:
+    """Load a batch of same-format files (module-level so worker processes can pickle it)."""
+    suffix, paths = suffix_paths
+    loader_cls = _loader_class(FILE_LOADERS[suffix])
+    documents = []
+    for path in paths:
+        try:
+            documents.extend(loader_cls(path).load())
+            print(f"Loaded {suffix} file: {path}")
+        except Exception as e:
+            print(f"Error loading {suffix} file {path}: {e}")
+    return documents
+
+
+def _default_num_workers() -> int:
+    """Worker processes for document parsing: RAG_NUM_WORKERS, else all cores but one."""
+    configured = os.environ.get("RAG_NUM_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _print_ingest_progress(progress: dict, start: float):
+    """Print chunks written so far, throughput and (once splitting is done) an ETA."""
+    elapsed = time.monotonic() - start
+    rate = progress["written"] / elapsed if elapsed > 0 else 0.0
+    if progress["splitting"] or rate == 0:
+        eta = "unknown"
+    else:
+        eta = f"{(progress['queued'] - progress['written']) / rate:.0f}s"
+    print(f"Embedded {progress['written']}/{progress['queued']} chunks ({rate:.1f} chunks/s, ETA {eta})")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that persists vectors in SQLite, keyed by content hash.
+    
+    Only texts missing from the cache are sent to the wrapped model, so
+    re-ingesting a corpus or repeating a query costs a hash and a lookup.
+    Vectors are stored as float16 to halve the cache size.
+    """
+    
+    _LOOKUP_BATCH = 500  # stays under SQLite's bound-parameter limit
+    
+    def __init__(self, embeddings: Embeddings, path: str, namespace: str = ""):
+        """
+        Args:
+            embeddings: Underlying embedding model
+            path: SQLite file holding the cache
+            namespace: Prefix mixed into every key, e.g. the model name
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "doc", self.embeddings.embed_documents)
+    
+    def embed_query(self, text: str) -> List[float]:
+        # Query and document embeddings may use different instructions, so they are keyed apart
+        return self._embed([text], "query", lambda missing: [self.embeddings.embed_query(missing[0])])[0]
+    
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+    
+    def _key(self, kind: str, text: str) -> str:
+        return blake2b(f"{self.namespace}\0{kind}\0{text}".encode(), digest_size=16).hexdigest()
+    
+    def _embed(self, texts: List[str], kind: str,
+               embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        vectors = self._lookup(list(dict.fromkeys(keys)))
+        
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = embed_fn(list(missing.values()))
+            rows = [
+                (key, np.asarray(vector, dtype=np.float16).tobytes())
+                for key, vector in zip(missing, computed)
+            ]
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows)
+            vectors.update({key: _decode_vector(blob) for key, blob in rows})
+        
+        return [vectors[key] for key in keys]
+    
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for key, blob in self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", batch
+                ):
+                    found[key] = _decode_vector(blob)
+        return found
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Matryoshka-style truncation: keep the first ``dimensions`` components and
+    re-normalize to unit length.
+    
+    Only meaningful for models trained with Matryoshka representation learning
+    (e.g. nomic-embed-text, mxbai-embed-large), whose leading dimensions carry
+    most of the signal; it shrinks the stored vectors and speeds up search.
+    """
+    
+    def __init__(self, embeddings: Embeddings, dimensions: int):
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)[:, :self.dimensions]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms == 0, 1, norms)).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return _normalize(self.embeddings.embed_query(text)[:self.dimensions]).tolist()
+
+
+def _decode_vector(blob: bytes) -> List[float]:
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+
+class SemanticQueryCache:
+    """
+    Cache of answered questions matched by embedding similarity.
+    
+    Question vectors are bucketed with random-projection LSH (``num_tables``
+    tables of ``num_bits``-bit signatures). A lookup only computes cosine
+    similarity against vectors sharing a bucket, and returns the stored
+    response when the best match reaches ``threshold``, so paraphrased
+    repeats skip retrieval and generation.
+    
+    Answers are only valid for the corpus they were retrieved from, so the
+    cache records a ``corpus`` key (a corpus fingerprint) and is cleared
+    whenever the corpus changes.
+    """
+    
+    def __init__(self, threshold: float = 0.95, num_bits: int = 16, num_tables: int = 8,
+                 seed: int = 0, path: Optional[str] = None,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            num_bits: Hyperplanes per hash table
+            num_tables: Independent hash tables probed per lookup
+            seed: Seed for the random hyperplanes
+            path: Pickle file the cache is loaded from and saved to at exit
+            max_entries: Answers kept; the least recently used are evicted
+        """
+        self.threshold = threshold
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.seed = seed
+        self.path = path
+        self.max_entries = max_entries
+        self.corpus = None
+        self._planes = None  # created once the embedding dimension is known
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self._tables = [{} for _ in range(num_tables)]
+        # Entry id -> (vector, response, buckets), least recently used first
+        self._entries = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        
+        if path:
+            self._load(path)
+            atexit.register(self.save)
+    
+    def get(self, vector: List[float], question: Optional[str] = None) -> Optional[dict]:
+        """
+        Return the cached response for the most similar question, if close enough.
+        
+        Each hit is a copy (with its own context list), so callers may modify
+        it freely; ``input`` is set to ``question`` when given.
+        """
+        query = _normalize(vector)
+        with self._lock:
+            if self._planes is None:
+                return None
+            candidates = set()
+            for table, bucket in zip(self._tables, self._buckets(query)):
+                candidates.update(table.get(bucket, ()))
+            if not candidates:
+                return None
+            candidates = list(candidates)
+            scores = np.stack([self._entries[i][0] for i in candidates]).astype(np.float32) @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._entries.move_to_end(candidates[best])
+            response = self._entries[candidates[best]][1]
+        hit = _copy_response(response)
+        if question is not None:
+            hit["input"] = question
+        return hit
+    
+    def add(self, vector: List[float], response: dict):
+        """Remember (a copy of) the response for a question vector."""
+        response = _copy_response(response)
+        normalized = _normalize(vector)
+        with self._lock:
+            if self._planes is None:
+                rng = np.random.default_rng(self.seed)
+                self._planes = rng.standard_normal(
+                    (self.num_tables, self.num_bits, normalized.shape[0])
+                ).astype(np.float32)
+            entry_id = self._next_id
+            self._next_id += 1
+            buckets = self._buckets(normalized)
+            self._entries[entry_id] = (normalized.astype(np.float16), response, buckets)
+            for table, bucket in zip(self._tables, buckets):
+                table.setdefault(bucket, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+    
+    def clear(self, corpus: Optional[str] = None):
+        """Drop every cached answer and start caching for the given corpus key."""
+        with self._lock:
+            self._tables = [{} for _ in range(self.num_tables)]
+            self._entries.clear()
+            self.corpus = corpus
+    
+    def save(self, path: Optional[str] = None):
+        """Persist the corpus key and the cached vectors and responses."""
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            entries = list(self._entries.values())
+            state = {
+                "corpus": self.corpus,
+                "vectors": [vector for vector, _, _ in entries],
+                "responses": [response for _, response, _ in entries],
+            }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as fh:
+            pickle.dump(state, fh)
+    
+    def _load(self, path: str):
+        if not Path(path).exists():
+            return
+        try:
+            with open(path, "rb") as fh:
+                state = pickle.load(fh)
+        except Exception as e:
+            print(f"Error loading semantic query cache {path}: {e}")
+            return
+        self.corpus = state.get("corpus")
+        for vector, response in zip(state["vectors"], state["responses"]):
+            self.add(vector, response)
+    
+    def _evict_oldest(self):
+        entry_id, (_, _, buckets) = self._entries.popitem(last=False)
+        for table, bucket in zip(self._tables, buckets):
+            ids = table[bucket]
+            ids.remove(entry_id)
+            if not ids:
+                del table[bucket]
+    
+    def _buckets(self, vector: np.ndarray) -> List[int]:
+        bits = (self._planes @ vector) > 0
+        return (bits @ self._bit_weights).tolist()
+
+
+def _copy_response(response: dict) -> dict:
+    copied = dict(response)
+    if isinstance(copied.get("context"), list):
+        copied["context"] = list(copied["context"])
+    return copied
+
+
+def _normalize(vector: List[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+def corpus_fingerprint(directory_path: str) -> str:
+    """SHA-256 over the path, size and mtime of every supported file under a directory."""
+    digest = sha256()
+    files = sorted(
+        file_path for file_path in Path(directory_path).rglob('*')
+        if file_path.suffix.lower() in FILE_LOADERS and file_path.is_file()
+    )
+    for file_path in files:
+        stat = file_path.stat()
+        digest.update(f"{file_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _content_hash(text: str) -> bytes:
+    return blake2b(text.encode(), digest_size=16).digest()
+
+
 class EnhancedRAG:
-    def __init__(self, model: str = "gemma2:7b", embedding_dimensions: int = 768):
+    def __init__(self, model: str = "gemma2:7b", embedding_dimensions: int = 768,
+                 num_workers: Optional[int] = None, embed_workers: int = 4,
+                 embedding_cache_path: Optional[str] = EMBEDDING_CACHE_PATH,
+                 semantic_cache_threshold: Optional[float] = None,
+                 semantic_cache_path: Optional[str] = None,
+                 truncate_dims: Optional[int] = None,
+                 vector_store_path: Optional[str] = VECTOR_STORE_PATH):
         """
         Initialize the RAG pipeline with specified model and embedding dimensions.
         
         Args:
             model: Ollama model name
             embedding_dimensions: Dimensions for embeddings (default: 768)
+            num_workers: Processes used to parse files in load_directory
+                (default: RAG_NUM_WORKERS env var, else CPU count - 1)
+            embed_workers: Threads embedding and writing chunk batches concurrently
+            embedding_cache_path: SQLite file caching embeddings by content hash
+                (None disables the cache)
+            semantic_cache_threshold: Cosine similarity at which a previous
+                answer is reused for a new question, e.g. 0.95 (default None:
+                no semantic cache). Cached answers are dropped whenever
+                documents are ingested.
+            semantic_cache_path: File the semantic query cache persists to
+            truncate_dims: Keep only this many leading embedding dimensions
+                (Matryoshka truncation, e.g. 256); use only with MRL-trained
+                embedding models. Overrides embedding_dimensions.
+            vector_store_path: Directory the vector store persists under (one
+                subdirectory per model); an existing store built with the same
+                model and dimensions is reopened instead of re-ingested.
+                None keeps ObjectBox's default, unmanaged location.
         """
+        # All Ollama generate/embed calls share one pooled HTTP session
+        _ollama_pool.install()
+        self.model = model
         self.llm = Ollama(model=model)
         self.embeddings = OllamaEmbeddings(model=model)
+        if embedding_cache_path:
+            self.embeddings = CachedEmbeddings(self.embeddings, embedding_cache_path, namespace=model)
+        if truncate_dims:
+            # Truncate outside the cache so it keeps full vectors for any dimension
+            self.embeddings = TruncatedEmbeddings(self.embeddings, truncate_dims)
+            embedding_dimensions = truncate_dims
         self.embedding_dimensions = embedding_dimensions
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
+        self.num_workers = num_workers or _default_num_workers()
+        self.embed_workers = max(1, embed_workers)
+        self.chunk_size = CHUNK_SIZE
+        self.chunk_overlap = CHUNK_OVERLAP
         self.vector_store = None
+        self.vector_store_path = None
+        if vector_store_path:
+            self.vector_store_path = str(Path(vector_store_path) / model.replace(":", "_").replace("/", "_"))
+        self.corpus_fingerprint = None
+        # Content hash -> vector store id, and -> metadata of every occurrence
+        self.chunk_ids: Dict[bytes, str] = {}
+        self.chunk_sources: Dict[bytes, List[dict]] = {}
+        self.document_chain = None
         self.retrieval_chain = None
+        self.query_cache = None
+        if semantic_cache_threshold is not None:
+            self.query_cache = SemanticQueryCache(threshold=semantic_cache_threshold, path=semantic_cache_path)
+        if self.vector_store_path:
+            self.open_vector_store()
         
         # Define the prompt template
         self.prompt = ChatPromptTemplate.from_template("""
@@ -54,20 +459,28 @@ class EnhancedRAG:
     
     def load_pdf_documents(self, pdf_paths: Union[str, List[str]]) -> List[Document]:
         """Load PDF documents."""
+        return list(self.iter_pdf_documents(pdf_paths))
+    
+    def iter_pdf_documents(self, pdf_paths: Union[str, List[str]]) -> Iterator[Document]:
+        """
+        Lazily yield PDF pages as Documents.
+        
+        Pages are parsed one at a time, so passing this straight to
+        create_vector_store or add_documents keeps memory flat however large
+        the PDFs are.
+        """
         if isinstance(pdf_paths, str):
             pdf_paths = [pdf_paths]
         
-        documents = []
         for pdf_path in pdf_paths:
+            pages = 0
             try:
-                loader = PyPDFLoader(pdf_path)
-                docs = loader.load()
-                documents.extend(docs)
-                print(f"Loaded PDF: {pdf_path} ({len(docs)} pages)")
+                for doc in _loader_class("PyPDFLoader")(pdf_path).lazy_load():
+                    pages += 1
+                    yield doc
+                print(f"Loaded PDF: {pdf_path} ({pages} pages)")
             except Exception as e:
                 print(f"Error loading PDF {pdf_path}: {e}")
-        
-        return documents
     
     def load_word_documents(self, word_paths: Union[str, List[str]]) -> List[Document]:
         """Load Word documents (.docx)."""
@@ -77,7 +490,7 @@ class EnhancedRAG:
         documents = []
         for word_path in word_paths:
             try:
-                loader = Docx2txtLoader(word_path)
+                loader = _loader_class("Docx2txtLoader")(word_path)
                 docs = loader.load()
                 documents.extend(docs)
                 print(f"Loaded Word document: {word_path}")
@@ -94,7 +507,7 @@ class EnhancedRAG:
         documents = []
         for text_path in text_paths:
             try:
-                loader = TextLoader(text_path)
+                loader = _loader_class("TextLoader")(text_path)
                 docs = loader.load()
                 documents.extend(docs)
                 print(f"Loaded text file: {text_path}")
@@ -111,7 +524,7 @@ class EnhancedRAG:
         documents = []
         for csv_path in csv_paths:
             try:
-                loader = CSVLoader(csv_path)
+                loader = _loader_class("CSVLoader")(csv_path)
                 docs = loader.load()
                 documents.extend(docs)
                 print(f"Loaded CSV file: {csv_path}")
@@ -128,7 +541,7 @@ class EnhancedRAG:
         documents = []
         for ppt_path in ppt_paths:
             try:
-                loader = UnstructuredPowerPointLoader(ppt_path)
+                loader = _loader_class("UnstructuredPowerPointLoader")(ppt_path)
                 docs = loader.load()
                 documents.extend(docs)
                 print(f"Loaded PowerPoint: {ppt_path}")
@@ -145,7 +558,7 @@ class EnhancedRAG:
         documents = []
         for excel_path in excel_paths:
             try:
-                loader = UnstructuredExcelLoader(excel_path)
+                loader = _loader_class("UnstructuredExcelLoader")(excel_path)
                 docs = loader.load()
                 documents.extend(docs)
                 print(f"Loaded Excel file: {excel_path}")
@@ -155,24 +568,54 @@ class EnhancedRAG:
         return documents
     
     def load_web_documents(self, urls: Union[str, List[str]]) -> List[Document]:
-        """Load documents from web URLs."""
+        """Load documents from web URLs, fetching them concurrently."""
         if isinstance(urls, str):
             urls = [urls]
+        if not urls:
+            return []
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._aload_urls(urls))
+        # Already inside an event loop (e.g. an agent tool call): fetch on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._aload_urls(urls)).result()
+    
+    async def _aload_urls(self, urls: List[str]) -> List[Document]:
+        """Fetch all URLs over one aiohttp session and parse each page to a Document."""
+        timeout = aiohttp.ClientTimeout(total=WEB_FETCH_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=WEB_FETCH_CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            pages = await asyncio.gather(
+                *(self._afetch(session, url) for url in urls),
+                return_exceptions=True
+            )
+        
+        from bs4 import BeautifulSoup
         
         documents = []
-        for url in urls:
-            try:
-                loader = WebBaseLoader(url)
-                docs = loader.load()
-                documents.extend(docs)
-                print(f"Loaded web content: {url}")
-            except Exception as e:
-                print(f"Error loading web content {url}: {e}")
+        for url, page in zip(urls, pages):
+            if isinstance(page, BaseException):
+                print(f"Error loading web content {url}: {page}")
+                continue
+            soup = BeautifulSoup(page, "html.parser")
+            metadata = {"source": url}
+            if soup.title and soup.title.string:
+                metadata["title"] = soup.title.string.strip()
+            documents.append(Document(page_content=soup.get_text(), metadata=metadata))
+            print(f"Loaded web content: {url}")
         
         return documents
     
+    @staticmethod
+    async def _afetch(session: aiohttp.ClientSession, url: str) -> str:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.text()
+    
     def load_directory(self, directory_path: str) -> List[Document]:
-        """Load all supported documents from a directory."""
+        """Load all supported documents from a directory, parsing files in parallel."""
         directory = Path(directory_path)
         documents = []
         
@@ -180,42 +623,297 @@ class EnhancedRAG:
             print(f"Directory {directory_path} does not exist")
             return documents
         
-        # Define file extensions and their corresponding loaders
-        file_loaders = {
-            '.pdf': self.load_pdf_documents,
-            '.docx': self.load_word_documents,
-            '.txt': self.load_text_documents,
-            '.csv': self.load_csv_documents,
-            '.pptx': self.load_powerpoint_documents,
-            '.xlsx': self.load_excel_documents
-        }
-        
+        files_by_suffix = defaultdict(list)
         for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in file_loaders:
-                loader_func = file_loaders[file_path.suffix.lower()]
-                docs = loader_func(str(file_path))
-                documents.extend(docs)
+            suffix = file_path.suffix.lower()
+            if suffix in FILE_LOADERS and file_path.is_file():
+                files_by_suffix[suffix].append(str(file_path))
+        file_count = sum(len(paths) for paths in files_by_suffix.values())
+        
+        # PDF/Office parsing is CPU-bound, so spread files across processes.
+        # Work is handed out as same-format batches, so each worker only pays
+        # the (often heavy) import/setup cost of the loaders it actually uses.
+        if self.num_workers > 1 and file_count > 1:
+            groups = []
+            for suffix, paths in files_by_suffix.items():
+                batch_size = -(-len(paths) // self.num_workers)
+                groups += [(suffix, paths[i:i + batch_size]) for i in range(0, len(paths), batch_size)]
+            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+                for docs in executor.map(_load_group, groups):
+                    documents.extend(docs)
+        else:
+            for group in files_by_suffix.items():
+                documents.extend(_load_group(group))
         
         print(f"Loaded {len(documents)} documents from directory: {directory_path}")
         return documents
     
-    def create_vector_store(self, documents: List[Document]):
-        """Create vector store from documents."""
-        if not documents:
+    def create_vector_store(self, documents: Iterable[Document], fingerprint: Optional[str] = None):
+        """
+        Create vector store from documents (a list or a lazy iterator).
+        
+        Any store previously persisted at vector_store_path is replaced.
+        
+        Args:
+            documents: Documents to ingest
+            fingerprint: corpus_fingerprint() of the sources, recorded so
+                load_or_create_vector_store can tell when they change
+        """
+        documents = iter(documents)
+        first = next(documents, None)
+        if first is None:
             print("No documents provided for vector store creation")
             return
         
-        # Split documents into chunks
-        split_documents = self.text_splitter.split_documents(documents)
-        print(f"Split {len(documents)} documents into {len(split_documents)} chunks")
+        # Create vector store, then stream the chunks into it; the old manifest
+        # goes first so a failed ingest is never mistaken for a complete store
+        manifest_file = self._manifest_file()
+        if manifest_file is not None:
+            manifest_file.unlink(missing_ok=True)
+        self._close_vector_store()
+        self.vector_store = self._new_vector_store(clear=True)
+        self.chunk_ids = {}
+        self.chunk_sources = {}
+        self.corpus_fingerprint = fingerprint
+        self._reset_query_cache()
+        document_count, chunk_count = self._ingest(chain([first], documents))
+        # Answers cached while ingesting saw only part of the documents
+        self._reset_query_cache()
+        self._write_manifest()
+        print(f"Split {document_count} documents into {chunk_count} chunks")
+        print("Vector store created successfully")
+    
+    def open_vector_store(self, fingerprint: Optional[str] = None) -> bool:
+        """
+        Reopen the vector store persisted at vector_store_path.
+        
+        Only succeeds when the store was built with the same model and
+        embedding dimensions and, if given, the same corpus fingerprint.
+        
+        Returns:
+            True if the persisted store is now in use
+        """
+        manifest = self._read_manifest()
+        if manifest is None:
+            return False
+        if manifest["model"] != self.model or manifest["dimensions"] != self.embedding_dimensions:
+            return False
+        if fingerprint is not None and manifest["fingerprint"] != fingerprint:
+            return False
         
-        # Create vector store
-        self.vector_store = ObjectBox.from_documents(
-            split_documents, 
-            self.embeddings, 
-            embedding_dimensions=self.embedding_dimensions
+        self._close_vector_store()
+        self.vector_store = self._new_vector_store(clear=False)
+        self.corpus_fingerprint = manifest["fingerprint"]
+        self.chunk_ids = manifest["chunk_ids"]
+        self.chunk_sources = manifest["chunk_sources"]
+        # Answers persisted for another (or an unfingerprinted) corpus are stale
+        if self.query_cache is not None and (
+            self.corpus_fingerprint is None or self.query_cache.corpus != self.corpus_fingerprint
+        ):
+            self._reset_query_cache()
+        print(f"Opened vector store at {self.vector_store_path} ({len(self.chunk_sources)} chunks)")
+        return True
+    
+    def load_or_create_vector_store(self, directory_path: str):
+        """
+        Reuse the persisted vector store for a directory, rebuilding it only
+        when the directory's files (paths, sizes, mtimes) have changed.
+        """
+        fingerprint = corpus_fingerprint(directory_path)
+        if self.open_vector_store(fingerprint):
+            return
+        self.create_vector_store(self.load_directory(directory_path), fingerprint=fingerprint)
+    
+    def _reset_query_cache(self):
+        if self.query_cache is not None:
+            self.query_cache.clear(self.corpus_fingerprint)
+    
+    def _new_vector_store(self, clear: bool) -> ObjectBox:
+        if not self.vector_store_path:
+            return ObjectBox(embedding=self.embeddings, embedding_dimensions=self.embedding_dimensions)
+        return ObjectBox(
+            embedding=self.embeddings,
+            embedding_dimensions=self.embedding_dimensions,
+            db_directory=self.vector_store_path,
+            clear_db=clear
         )
-        print("Vector store created successfully")
+    
+    def _close_vector_store(self):
+        # ObjectBox allows one open Store per directory, so release it before reopening/clearing
+        store = getattr(self.vector_store, "_db", None)
+        if store is not None:
+            store.close()
+        self.vector_store = None
+    
+    def _manifest_file(self) -> Optional[Path]:
+        if not self.vector_store_path:
+            return None
+        return Path(self.vector_store_path).parent / f"{Path(self.vector_store_path).name}.manifest.pickle"
+    
+    def _read_manifest(self) -> Optional[dict]:
+        manifest_file = self._manifest_file()
+        if manifest_file is None or not manifest_file.exists() or not Path(self.vector_store_path).exists():
+            return None
+        try:
+            with open(manifest_file, "rb") as fh:
+                return pickle.load(fh)
+        except Exception as e:
+            print(f"Error reading vector store manifest {manifest_file}: {e}")
+            return None
+    
+    def _write_manifest(self):
+        manifest_file = self._manifest_file()
+        if manifest_file is None:
+            return
+        manifest = {
+            "model": self.model,
+            "dimensions": self.embedding_dimensions,
+            "fingerprint": self.corpus_fingerprint,
+            "chunk_ids": self.chunk_ids,
+            "chunk_sources": self.chunk_sources,
+        }
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest_file, "wb") as fh:
+            pickle.dump(manifest, fh)
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split documents into chunks, merging undersized chunks.
+        
+        Each document is cut by the linear-scan splitter in fast_split, then
+        adjacent chunks from the same source shorter than MIN_CHUNK_SIZE are
+        merged (up to chunk_size), which leaves fewer, more uniform chunks to
+        embed and index. Documents already within chunk_size (web snippets,
+        previously chunked text) are passed through without scanning.
+        """
+        chunks = []
+        for document in documents:
+            if len(document.page_content) <= self.chunk_size:
+                if document.page_content.strip():
+                    chunks.append(document)
+                continue
+            chunks.extend(
+                Document(page_content=text, metadata=dict(document.metadata))
+                for text in split_text(document.page_content, CHUNK_SEPARATORS, self.chunk_size, self.chunk_overlap)
+            )
+        merged = []
+        for chunk in chunks:
+            previous = merged[-1] if merged else None
+            if (
+                previous is not None
+                and previous.metadata == chunk.metadata
+                and min(len(previous.page_content), len(chunk.page_content)) < MIN_CHUNK_SIZE
+                and len(previous.page_content) + 1 + len(chunk.page_content) <= self.chunk_size
+            ):
+                merged[-1] = Document(
+                    page_content=f"{previous.page_content}\n{chunk.page_content}",
+                    metadata=previous.metadata
+                )
+            else:
+                merged.append(chunk)
+        return merged
+    
+    def _ingest(self, documents: Iterable[Document]) -> Tuple[int, int]:
+        """
+        Split, embed and write documents as overlapping pipeline stages.
+        
+        A splitter thread feeds batches of chunks through a bounded queue to
+        ``embed_workers`` threads that each embed and write their batch, so
+        Ollama round-trips overlap with splitting and with each other.
+        
+        Documents are pulled from the iterable SPLIT_BATCH_SIZE at a time, so
+        lazy loaders are never materialized in full. Chunks whose content was
+        already ingested are not embedded again; their metadata is recorded
+        in chunk_sources under the content hash instead. A chunk only enters
+        chunk_sources once its batch is written, so chunks of a failed batch
+        are embedded again when the same documents are ingested again.
+        
+        Returns:
+            Number of documents read and chunks written to the vector store
+        """
+        chunk_queue = queue.Queue(maxsize=self.embed_workers * 2)
+        lock = threading.Lock()
+        errors = []
+        progress = {"documents": 0, "duplicates": 0, "queued": 0, "written": 0, "splitting": True}
+        # Content hash -> metadata of chunks queued but not yet written
+        pending: Dict[bytes, List[dict]] = {}
+        start = time.monotonic()
+        
+        def split_stage():
+            try:
+                hashes, batch = [], []
+                documents_iter = iter(documents)
+                while True:
+                    docs = list(islice(documents_iter, SPLIT_BATCH_SIZE))
+                    if not docs:
+                        break
+                    progress["documents"] += len(docs)
+                    for chunk in self.split_documents(docs):
+                        content_hash = _content_hash(chunk.page_content)
+                        with lock:
+                            sources = self.chunk_sources.get(content_hash) or pending.get(content_hash)
+                            if sources is not None:
+                                sources.append(chunk.metadata)
+                                progress["duplicates"] += 1
+                                continue
+                            pending[content_hash] = [chunk.metadata]
+                        hashes.append(content_hash)
+                        batch.append(chunk)
+                        if len(batch) == EMBED_BATCH_SIZE:
+                            self._queue_chunks(chunk_queue, (hashes, batch), progress, lock)
+                            hashes, batch = [], []
+                if batch:
+                    self._queue_chunks(chunk_queue, (hashes, batch), progress, lock)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                with lock:
+                    progress["splitting"] = False
+                for _ in range(self.embed_workers):
+                    chunk_queue.put(_PIPELINE_DONE)
+        
+        def embed_stage():
+            while True:
+                item = chunk_queue.get()
+                if item is _PIPELINE_DONE:
+                    return
+                if errors:
+                    # Keep draining so the splitter never blocks on a full queue
+                    continue
+                hashes, batch = item
+                try:
+                    ids = self.vector_store.add_documents(batch)
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                with lock:
+                    for content_hash in hashes:
+                        self.chunk_sources[content_hash] = pending.pop(content_hash)
+                    self.chunk_ids.update(zip(hashes, ids or []))
+                    progress["written"] += len(batch)
+                    _print_ingest_progress(progress, start)
+        
+        threads = [threading.Thread(target=split_stage, daemon=True)]
+        threads += [threading.Thread(target=embed_stage, daemon=True) for _ in range(self.embed_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if errors:
+            # Unwritten chunks never reached chunk_sources; drop them so a
+            # retry embeds and writes them
+            pending.clear()
+            raise errors[0]
+        if progress["duplicates"]:
+            print(f"Skipped {progress['duplicates']} duplicate chunks")
+        return progress["documents"], progress["written"]
+    
+    @staticmethod
+    def _queue_chunks(chunk_queue: queue.Queue, item: Tuple[List[bytes], List[Document]], progress: dict, lock: threading.Lock):
+        with lock:
+            progress["queued"] += len(item[1])
+        chunk_queue.put(item)
     
     def setup_retrieval_chain(self):
         """Setup the retrieval chain for Q&A."""
@@ -224,16 +922,16 @@ class EnhancedRAG:
             return
         
         # Create document chain
-        document_chain = create_stuff_documents_chain(self.llm, self.prompt)
+        self.document_chain = create_stuff_documents_chain(self.llm, self.prompt)
         
         # Create retriever
         retriever = self.vector_store.as_retriever(
             search_type="similarity",
-            search_kwargs={"k": 5}  # Retrieve top 5 similar chunks
+            search_kwargs={"k": RETRIEVAL_K}
         )
         
         # Create retrieval chain
-        self.retrieval_chain = create_retrieval_chain(retriever, document_chain)
+        self.retrieval_chain = create_retrieval_chain(retriever, self.document_chain)
         print("Retrieval chain setup completed")
     
     def query(self, question: str) -> dict:
@@ -242,23 +940,85 @@ class EnhancedRAG:
             return {"error": "Retrieval chain not setup. Please setup the chain first."}
         
         try:
+            query_vector = None
+            if self.query_cache is not None:
+                query_vector = self.embeddings.embed_query(question)
+                cached = self.query_cache.get(query_vector, question)
+                if cached is not None:
+                    return cached
+            
             response = self.retrieval_chain.invoke({"input": question})
+            if query_vector is not None:
+                self.query_cache.add(query_vector, response)
+            return response
+        except Exception as e:
+            return {"error": f"Error during query: {e}"}
+    
+    async def aquery(self, question: str) -> dict:
+        """Query the RAG system without blocking the event loop."""
+        return (await self.aquery_batch([question]))[0]
+    
+    async def aquery_batch(self, questions: List[str]) -> List[dict]:
+        """
+        Answer several questions concurrently.
+        
+        All questions are embedded up front (concurrently, through the
+        embedding cache), then retrieval and LLM generation for each question
+        overlap instead of running back to back. Responses have the same
+        shape as query() and come back in input order.
+        """
+        if self.retrieval_chain is None:
+            return [{"error": "Retrieval chain not setup. Please setup the chain first."} for _ in questions]
+        
+        try:
+            query_vectors = await asyncio.gather(
+                *(asyncio.to_thread(self.embeddings.embed_query, question) for question in questions)
+            )
+        except Exception as e:
+            return [{"error": f"Error during query: {e}"} for _ in questions]
+        
+        return list(await asyncio.gather(
+            *(self._aanswer(question, vector) for question, vector in zip(questions, query_vectors))
+        ))
+    
+    async def _aanswer(self, question: str, query_vector: List[float]) -> dict:
+        try:
+            if self.query_cache is not None:
+                cached = self.query_cache.get(query_vector, question)
+                if cached is not None:
+                    return cached
+            
+            # Same output as the retrieval chain, reusing the precomputed query vector
+            context = await asyncio.to_thread(
+                self.vector_store.similarity_search_by_vector, query_vector, k=RETRIEVAL_K
+            )
+            answer = await self.document_chain.ainvoke({"input": question, "context": context})
+            response = {"input": question, "context": context, "answer": answer}
+            if self.query_cache is not None:
+                self.query_cache.add(query_vector, response)
             return response
         except Exception as e:
             return {"error": f"Error during query: {e}"}
     
-    def add_documents(self, documents: List[Document]):
-        """Add new documents to existing vector store."""
+    def add_documents(self, documents: Iterable[Document]):
+        """Add new documents (a list or a lazy iterator) to existing vector store."""
         if self.vector_store is None:
             print("Creating new vector store...")
             self.create_vector_store(documents)
         else:
             print("Adding documents to existing vector store...")
-            split_documents = self.text_splitter.split_documents(documents)
-            self.vector_store.add_documents(split_documents)
-            print(f"Added {len(split_documents)} document chunks to vector store")
+            # The store no longer mirrors a single fingerprinted directory
+            self.corpus_fingerprint = None
+            self._reset_query_cache()
+            _, chunk_count = self._ingest(documents)
+            # Answers cached while ingesting saw only part of the new documents
+            self._reset_query_cache()
+            self._write_manifest()
+            print(f"Added {chunk_count} document chunks to vector store")
 
-# Example usage
+# Example usage. RAG.py uses package-relative imports, so run it as a module
+# from the project root rather than as a script:
+#     python -m src.agents.history.RAG
 def main():
     # Initialize RAG system
     rag = EnhancedRAG(model="gemma2:7b")
@@ -272,6 +1032,7 @@ def main():
     
     # Load PDF files (uncomment if you have PDF files)
     # pdf_docs = rag.load_pdf_documents(["path/to/your/file.pdf"])
+    # (or pass rag.iter_pdf_documents(...) to create_vector_store to stream large PDFs)
     # documents.extend(pdf_docs)
     
     # Load Word documents (uncomment if you have Word files)
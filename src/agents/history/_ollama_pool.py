@@ -0,0 +1,54 @@
+"""
+Shared HTTP connection pool for the LangChain Ollama integrations.
+
+``langchain_community``'s ``Ollama`` and ``OllamaEmbeddings`` call the
+module-level ``requests.post``, which opens (and tears down) a new connection
+for every generate/embed request. Routing those modules through one pooled
+``requests.Session`` keeps connections to the Ollama server alive and shared
+across every EnhancedRAG instance in the process.
+"""
+
+import threading
+from types import ModuleType
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_CONNECTIONS = 32
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONNECTIONS)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+class _PooledRequests(ModuleType):
+    """Stand-in for the ``requests`` module whose ``post`` uses the shared session."""
+
+    def __init__(self):
+        super().__init__("requests")
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    @staticmethod
+    def post(url, *args, **kwargs):
+        return session.post(url, *args, **kwargs)
+
+
+def install():
+    """Point the LangChain Ollama modules at the shared session (idempotent)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from langchain_community.embeddings import ollama as ollama_embeddings
+        from langchain_community.llms import ollama as ollama_llms
+
+        pooled = _PooledRequests()
+        ollama_embeddings.requests = pooled
+        ollama_llms.requests = pooled
+        _installed = True
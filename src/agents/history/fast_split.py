@@ -0,0 +1,67 @@
+"""
+Linear-scan text splitter for RAG ingestion.
+
+Produces the same kind of chunks as a recursive character splitter (break on
+the highest-priority separator that fits, with overlap between neighbours)
+but walks the text once with a greedy window instead of recursively
+re-splitting overlong segments.
+"""
+
+from typing import List, Sequence
+
+
+def split_text(text: str, separators: Sequence[str], chunk_size: int, chunk_overlap: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most ``chunk_size`` characters.
+
+    Each window ends just after the last occurrence of the first separator
+    (in priority order) found inside it; an empty separator, or no match,
+    cuts at the window edge. The next window starts up to ``chunk_overlap``
+    characters before the previous cut, aligned to a word boundary.
+
+    Args:
+        text: Text to split
+        separators: Separators in priority order, e.g. paragraph, line, sentence, word
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Characters shared between consecutive chunks
+
+    Returns:
+        List of non-empty, stripped chunks
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+    chunks = []
+    length = len(text)
+    start = 0
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            end = _find_break(text, start, end, separators, chunk_overlap)
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+
+        next_start = end - chunk_overlap
+        if next_start > start and chunk_overlap:
+            # Begin the overlap on a word rather than mid-token
+            space = text.find(" ", next_start, end)
+            next_start = space + 1 if space != -1 else end
+        start = max(next_start, start + 1)
+    return chunks
+
+
+def _find_break(text: str, start: int, end: int, separators: Sequence[str], chunk_overlap: int) -> int:
+    """Return the cut position for the window text[start:end], just past the best separator."""
+    # Cuts inside the overlap would not advance the window
+    lowest = start + chunk_overlap + 1
+    for separator in separators:
+        if not separator:
+            return end
+        position = text.rfind(separator, lowest, end)
+        if position != -1:
+            return position + len(separator)
+    return end
@@ -8,11 +8,26 @@ from response.sub_agents.visionAgent import VisionAgent
 from response.sub_agents.voiceAgent import VoiceAgent
 from curriculum.sub_agents.pacingAndSequenceAgent import PacingAndSequenceAgent
 import logging
+import threading
 
 from .RAG import EnhancedRAG
+
+# One RAG pipeline per model, shared across tool calls so the Ollama clients,
+# caches and retrieval chain are built once
+_rag_instances = {}
+_rag_lock = threading.Lock()
+
+def _get_rag(model: str) -> EnhancedRAG:
+    with _rag_lock:
+        ragAgent = _rag_instances.get(model)
+        if ragAgent is None:
+            ragAgent = _rag_instances[model] = EnhancedRAG(model=model)
+        if ragAgent.retrieval_chain is None:
+            ragAgent.setup_retrieval_chain()
+        return ragAgent
+
 def rag_query(query:str, model="gemma3n:e2b-it-q4_k_m"):
-    ragAgent = EnhancedRAG(model=model)
-    ragAgent.setup_retrieval_chain()
+    ragAgent = _get_rag(model)
     print(f"\n**Question:** {query}")
     response = ragAgent.query(query)
     if "error" in response:
@@ -1,10 +1,10 @@
 from google.adk.agents import LlmAgent
 
 class PlanningAgent(LlmAgent):
-    def __init__(self):
+    def __init__(self, model="gemini-2.0-flash"):
         super().__init__(
             name="PlanningAgent",
-            model="gemini-2.0-flash",
+            model=model,
             description="Handles scheduling operations, google calender sync and notifications and reminders.",
             instruction="Schedules reminders and tasks in the google calender for the teacher."
         )
@@ -1,29 +1,31 @@
 import pocketflow as pf
 from ....utils import call_llm
-import json
+import numpy as np
+import string
+import textwrap
 
-class BetterPrompt(pf.Node):
-    def prep(self,shared):
-        query=shared['response_agent_query']
-        context=shared['response_agent_context']
-        return query,context
+# orjson parses LLM responses considerably faster; fall back to the stdlib
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
-    def exec(self,prep_res):
-        query,context=prep_res
+_loads = _json.loads
 
-        prompt=f'''
-        ### ROLE ###
-        You are an expert system specializing in information retrieval, semantic search, and search engine query optimization.
+# Static prompt scaffolding, dedented once; only query and context vary per call
+_BETTER_PROMPT_TEMPLATE = string.Template(textwrap.dedent("""\
+    ### ROLE ###
+    You are an expert system specializing in information retrieval, semantic search, and search engine query optimization.
 
-        ### OBJECTIVE ###
-        Your task is to take a user's natural language question and transform it into several optimized formats suitable for different search systems. You must analyze the user's core intent and generate multiple phrasings to maximize the chances of finding a relevant match in a knowledge base or on the web.
+    ### OBJECTIVE ###
+    Your task is to take a user's natural language question and transform it into several optimized formats suitable for different search systems. You must analyze the user's core intent and generate multiple phrasings to maximize the chances of finding a relevant match in a knowledge base or on the web.
 
-        ### ORIGINAL USER QUESTION ###
+    ### ORIGINAL USER QUESTION ###
 
-        {query}
+    ${query}
 
-        ### CONTEXT ###
-        {context}
+    ### CONTEXT ###
+    ${context}
 
 
     ### INSTRUCTIONS ###
@@ -39,19 +41,19 @@ class BetterPrompt(pf.Node):
     Your response must conform to the following JSON schema:
 
     ```json
-    {{
-    "vectorSearch": {{
+    {
+    "vectorSearch": {
         "hypotheticalAnswer": "string",
         "alternativePhrasings": [
         "string"
         ]
-    }},
-    "webSearch": {{
+    },
+    "webSearch": {
         "queries": [
         "string"
         ]
-    }}
-    }}
+    }
+    }
     ```
     **Schema Description:**
 
@@ -60,12 +62,32 @@ class BetterPrompt(pf.Node):
         * **`alternativePhrasings` (array of strings):** A list of different ways to ask the original question.
     * **`webSearch` (object):** Contains queries optimized for keyword search engines.
         * **`queries` (array of strings):** A list of concise, keyword-focused search terms.
-    '''
+""").strip())
+
+class BetterPrompt(pf.Node):
+    def __init__(self, embeddings=None, **kwargs):
+        """
+        Args:
+            embeddings: Optional LangChain embeddings; when given, all alternative
+                phrasings are embedded in one batched call during post
+        """
+        super().__init__(**kwargs)
+        self.embeddings = embeddings
+
+    def prep(self,shared):
+        query=shared['response_agent_query']
+        context=shared['response_agent_context']
+        return query,context
+
+    def exec(self,prep_res):
+        query,context=prep_res
+
+        prompt=_BETTER_PROMPT_TEMPLATE.substitute(query=query, context=context)
 
         response_text=call_llm(prompt)
         try:
-            response_dict = json.loads(response_text)
-        except json.JSONDecodeError:
+            response_dict = _loads(response_text)
+        except ValueError:
             print("Error: LLM did not return a valid JSON object.")
                    # Handle the error, maybe by returning a specific error structure
             return {"query": query, "code": "Error: Invalid JSON response from LLM"}
@@ -73,9 +95,13 @@ class BetterPrompt(pf.Node):
 
     def post(self,shared,prep_res,exec_res):
         query,context=prep_res
-        vector_q,web_q=exec_res['vectorSearch']['alternativePhrasing']
-        shared["vector_search_queries"]=vector_q
-        shared["web_search_queries"]=web_q
+        vector_qs=exec_res.get('vectorSearch',{}).get('alternativePhrasings',[])
+        web_qs=exec_res.get('webSearch',{}).get('queries',[])
+        shared["vector_search_queries"]=vector_qs
+        shared["web_search_queries"]=web_qs
+        if self.embeddings is not None and vector_qs:
+            # One batched embed request instead of a round-trip per phrasing
+            shared["vector_search_embeddings"]=np.asarray(self.embeddings.embed_documents(vector_qs),dtype=np.float32)
         shared["context"].append({"query":query,"tool_call":{"name":"better_prompt","tool_output":exec_res}})
         return "Refining the Prompt DONE"
 
@@ -9,7 +9,7 @@ from history.historyAgentADK import HistoryAgentADK
 import logging
 
 class ResponseAgentADK(LlmAgent):
-    def __init__(self, query, model="gemini-2.0-flash"):
+    def __init__(self, query=None, model="gemini-2.0-flash"):
         # Compose description and instruction dynamically
         desc = "Routes queries dynamically to expert sub-agents for content, vision or voice."
         instr = (
@@ -1,11 +1,17 @@
 from typing import List
 from google.adk.agents import LlmAgent
 from google.adk.agents.llm_agent import ToolUnion
+from google.adk.models import BaseLlm
+
+_DEFAULT_DESCRIPTION = "Dynamic router agent that delegates requests to sub-agents."
+_DEFAULT_INSTRUCTION = "You are the central router. Analyze each query and transfer to the best sub-agent."
+# Pydantic validates these into fresh lists, so a shared empty tuple is safe
+_EMPTY = ()
 
 class AgentRouter(LlmAgent):
     def __init__(self,
                  name: str = "AgentRouter",
-                 model: str = "gemini-2.0-flash",
+                 model: str | BaseLlm = "gemini-2.0-flash",
                  description: str | None = None,
                  instruction: str | None = None,
                  sub_agents: list | None = None,
@@ -15,7 +21,7 @@ class AgentRouter(LlmAgent):
 
         Args:
             name (str): Name of the agent router.
-            model (str): Model identifier.
+            model (str | BaseLlm): Model identifier or shared model object.
             description (str): High-level description of the router agent.
             instruction (str): Instructions guiding the LLM for delegation.
             sub_agents (list): List of sub-agent instances (LlmAgent objects).
@@ -23,10 +29,8 @@ class AgentRouter(LlmAgent):
         super().__init__(
             name=name,
             model=model,
-            description=description or "Dynamic router agent that delegates requests to sub-agents.",
-            instruction=instruction or (
-                "You are the central router. Analyze each query and transfer to the best sub-agent."
-            ),
-            tools=tool or [],
-            sub_agents=sub_agents or []
+            description=description or _DEFAULT_DESCRIPTION,
+            instruction=instruction or _DEFAULT_INSTRUCTION,
+            tools=tool or _EMPTY,
+            sub_agents=sub_agents or _EMPTY
         )
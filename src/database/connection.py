@@ -8,16 +8,36 @@ This module provides:
 - Error handling for database operations
 """
 
+from __future__ import annotations
+
 import os
 import logging
-from typing import Optional, Dict, Any
-from contextlib import contextmanager
-from objectbox import Store
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+from contextlib import contextmanager, nullcontext
+from objectbox import Box, Store
+from objectbox.query import Query
 
 from .models import Student, Interaction, LearningProgress, CurriculumContent
 
 logger = logging.getLogger(__name__)
 
+# Entities the Store is opened with: importing them registers each (once) in
+# ObjectBox's default model via @Entity
+ENTITY_CLASSES = (Student, Interaction, LearningProgress, CurriculumContent)
+
+# Objects written per transaction by bulk_put. Larger batches amortize the
+# commit, but hold the write lock longer; 1000 is a good middle ground
+BULK_PUT_BATCH_SIZE = 1000
+
+# Objects fetched per query page by paged_find / iter_all
+QUERY_PAGE_SIZE = 500
+
+# How long get_database_stats results are reused
+STATS_TTL_SECONDS = 1.0
+
 
 class DatabaseConfig:
     """Configuration class for ObjectBox database settings."""
@@ -26,39 +46,116 @@ class DatabaseConfig:
                  db_path: str = "data/objectbox",
                  max_db_size_in_kb: int = 1024 * 1024,  # 1GB
                  max_readers: int = 126,
-                 debug_flags: int = 0):
+                 debug_flags: int = 0,
+                 pool_size: int | None = None,
+                 file_mode: int | None = None,
+                 max_data_size_in_kb: int | None = None,
+                 read_only: bool = False,
+                 model_json_file: str | None = None):
         self.db_path = db_path
         self.max_db_size_in_kb = max_db_size_in_kb
         self.max_readers = max_readers
         self.debug_flags = debug_flags
+        # Concurrent read transactions handed out by ReadTxPool
+        self.pool_size = pool_size or min(max_readers, (os.cpu_count() or 1) * 2)
+        self.file_mode = file_mode
+        self.max_data_size_in_kb = max_data_size_in_kb
+        # Open without write access, e.g. for a separate reporting process;
+        # ObjectBox allows only one Store per directory within a process
+        self.read_only = read_only
+        # ObjectBox's model (entity/property/index IDs) is synced with this
+        # file; None uses the versioned objectbox-model.json in this package
+        self.model_json_file = model_json_file
+        
+        if self.pool_size > max_readers:
+            raise ValueError(f"pool_size ({self.pool_size}) cannot exceed max_readers ({max_readers})")
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         """Convert config to dictionary for ObjectBox Store options."""
-        return {
+        options = {
             "directory": self.db_path,
             "max_db_size_in_kb": self.max_db_size_in_kb,
             "max_readers": self.max_readers,
             "debug_flags": self.debug_flags
         }
+        # Optional knobs are only passed when set, leaving ObjectBox's defaults otherwise
+        if self.file_mode is not None:
+            options["file_mode"] = self.file_mode
+        if self.max_data_size_in_kb is not None:
+            options["max_data_size_in_kb"] = self.max_data_size_in_kb
+        if self.read_only:
+            options["read_only"] = True
+        if self.model_json_file is not None:
+            options["model_json_file"] = self.model_json_file
+        return options
+
+
+class ReadTxPool:
+    """
+    Hands out ObjectBox read transactions to concurrent readers.
+    
+    ObjectBox transactions are bound to the thread that opened them, so rather
+    than sharing open transactions between threads, each thread keeps its read
+    transaction open for the whole (possibly nested) read_tx() block and reuses
+    it for every query inside. A semaphore caps concurrent readers at
+    pool_size, keeping request fan-out below the Store's max_readers limit.
+    """
+    
+    def __init__(self, store: Store, pool_size: int):
+        self._store = store
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._local = threading.local()
+    
+    @contextmanager
+    def read_tx(self) -> Iterator[Store]:
+        """Run the block inside this thread's read transaction, opening it if needed."""
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth = depth + 1
+            try:
+                yield self._store
+            finally:
+                self._local.depth = depth
+            return
+        
+        with self._slots, self._store.read_tx():
+            self._local.depth = 1
+            try:
+                yield self._store
+            finally:
+                self._local.depth = 0
 
 
 class ObjectBoxManager:
     """Singleton manager for ObjectBox Store instance."""
     
-    _instance: Optional['ObjectBoxManager'] = None
-    _store: Optional[Store] = None
+    _instance: ObjectBoxManager | None = None
+    _store: Store | None = None
+    # Guards instance creation and Store open/close; re-entrant because
+    # get_store() calls initialize() while holding it
+    _lock = threading.RLock()
+    # Set on the instance once __init__ has run; every later
+    # ObjectBoxManager() returns after this single attribute check
+    _initialized = False
     
     def __new__(cls) -> 'ObjectBoxManager':
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = object.__new__(cls)
         return cls._instance
     
     def __init__(self):
-        if not hasattr(self, '_initialized'):
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            self._config: DatabaseConfig | None = None
+            self._read_pool: ReadTxPool | None = None
             self._initialized = True
-            self._config: Optional[DatabaseConfig] = None
     
-    def initialize(self, config: Optional[DatabaseConfig] = None) -> Store:
+    def initialize(self, config: DatabaseConfig | None = None) -> Store:
         """
         Initialize ObjectBox Store with configuration.
         
@@ -75,15 +172,23 @@ class ObjectBoxManager:
             logger.info("ObjectBox Store already initialized")
             return self._store
         
+        with self._lock:
+            # Another thread may have opened the Store while we waited;
+            # ObjectBox refuses a second Store on the same directory
+            if self._store is not None:
+                return self._store
+            return self._open_store(config)
+    
+    def _open_store(self, config: DatabaseConfig | None) -> Store:
         try:
             self._config = config or DatabaseConfig()
             
             # Create database directory if it doesn't exist
             os.makedirs(self._config.db_path, exist_ok=True)
             
-            # Create Store with configuration
-            # ObjectBox automatically discovers entities with @Entity decorator
-            self._store = Store(directory=self._config.db_path, model_classes=[Student, Interaction, LearningProgress, CurriculumContent])
+            # Create Store with configuration; the default model holds exactly ENTITY_CLASSES
+            self._store = Store(**self._config.to_dict())
+            self._read_pool = ReadTxPool(self._store, self._config.pool_size)
             
             logger.info(f"ObjectBox Store initialized at {self._config.db_path}")
             return self._store
@@ -96,34 +201,48 @@ class ObjectBoxManager:
     
     def get_store(self) -> Store:
         """
-        Get the ObjectBox Store instance.
+        Get the ObjectBox Store instance, initializing it on first use.
+        
+        The database directory and Store are only created when something
+        actually needs the database; the last configuration passed to
+        initialize() is used, or the defaults. Call initialize() explicitly
+        to fail early instead.
         
         Returns:
             ObjectBox Store instance
             
         Raises:
-            RuntimeError: If Store is not initialized
+            RuntimeError: If lazy initialization fails
         """
         if self._store is None:
-            raise RuntimeError("ObjectBox Store not initialized. Call initialize() first.")
+            with self._lock:
+                if self._store is None:
+                    self.initialize(self._config)
         return self._store
     
+    def get_read_pool(self) -> ReadTxPool:
+        """Get the read transaction pool, initializing the Store on first use."""
+        self.get_store()
+        return self._read_pool
+    
     def close(self):
         """Close the ObjectBox Store and cleanup resources."""
-        if self._store is not None:
-            try:
-                self._store.close()
-                logger.info("ObjectBox Store closed successfully")
-            except Exception as e:
-                logger.error(f"Error closing ObjectBox Store: {e}")
-            finally:
-                self._store = None
+        with self._lock:
+            if self._store is not None:
+                try:
+                    self._store.close()
+                    logger.info("ObjectBox Store closed successfully")
+                except Exception as e:
+                    logger.error(f"Error closing ObjectBox Store: {e}")
+                finally:
+                    self._store = None
+                    self._read_pool = None
     
     def is_initialized(self) -> bool:
         """Check if the ObjectBox Store is initialized."""
         return self._store is not None
     
-    def get_config(self) -> Optional[DatabaseConfig]:
+    def get_config(self) -> DatabaseConfig | None:
         """Get the current database configuration."""
         return self._config
 
@@ -132,7 +251,7 @@ class ObjectBoxManager:
 db_manager = ObjectBoxManager()
 
 
-def initialize_database(config: Optional[DatabaseConfig] = None) -> Store:
+def initialize_database(config: DatabaseConfig | None = None) -> Store:
     """
     Initialize the ObjectBox database with optional configuration.
     
@@ -147,13 +266,13 @@ def initialize_database(config: Optional[DatabaseConfig] = None) -> Store:
 
 def get_database() -> Store:
     """
-    Get the initialized ObjectBox Store instance.
+    Get the ObjectBox Store instance, initializing it with defaults on first use.
     
     Returns:
         ObjectBox Store instance
         
     Raises:
-        RuntimeError: If database is not initialized
+        RuntimeError: If database initialization fails
     """
     return db_manager.get_store()
 
@@ -164,34 +283,181 @@ def close_database():
 
 
 @contextmanager
-def database_transaction():
+def read_tx() -> Iterator[Store]:
+    """
+    Context manager running reads in a pooled, per-thread read transaction.
+    
+    Usage:
+        with read_tx() as store:
+            # Perform several queries against one snapshot
+            pass
+    """
+    with db_manager.get_read_pool().read_tx() as store:
+        yield store
+
+
+@contextmanager
+def database_transaction(mode: str | None = "write"):
     """
     Context manager for database transactions.
     
+    By default the block runs in one write transaction: every put/remove
+    inside commits together when the block exits, or rolls back if it raises.
+    
+    Args:
+        mode: "write" (default) for a write transaction, "read" for a pooled
+            read transaction (see read_tx), or None to let ObjectBox open one
+            implicit transaction per operation
+    
     Usage:
         with database_transaction():
             # Perform database operations
             pass
     """
+    if mode not in (None, "read", "write"):
+        raise ValueError(f"Unknown transaction mode: {mode}")
+    
     store = get_database()
+    if mode == "read":
+        tx = db_manager.get_read_pool().read_tx()
+    elif mode == "write":
+        tx = store.write_tx()
+    else:
+        tx = nullcontext()
     
-    # ObjectBox handles transactions automatically for most operations
-    # This context manager provides a consistent interface
     try:
-        yield store
+        with tx:
+            yield store
     except Exception as e:
         logger.error(f"Database transaction failed: {e}")
         raise
 
 
+def bulk(fn: Callable[[Any], Any], items: Iterable[Any], chunk: int = BULK_PUT_BATCH_SIZE) -> int:
+    """
+    Apply fn to every item, committing one write transaction per chunk of items.
+    
+    Args:
+        fn: Database operation to run per item, e.g. a repository method
+        items: Items to process
+        chunk: Items per transaction
+        
+    Returns:
+        Number of items processed
+        
+    Raises:
+        ValueError: If chunk is not positive
+    """
+    if chunk < 1:
+        raise ValueError("chunk must be positive")
+    
+    items = items if isinstance(items, list) else list(items)
+    for start in range(0, len(items), chunk):
+        with database_transaction("write"):
+            for item in items[start:start + chunk]:
+                fn(item)
+    return len(items)
+
+
+def bulk_put(box: Box, objects: Iterable[Any], batch_size: int = BULK_PUT_BATCH_SIZE) -> int:
+    """
+    Insert or update many objects, committing one write transaction per batch.
+    
+    Each batch goes to ObjectBox as a single put of a list, so the commit and
+    the Python/C boundary crossing are paid per batch instead of per object.
+    New objects get their IDs assigned in place.
+    
+    Args:
+        box: Box of the objects' entity
+        objects: Objects to put
+        batch_size: Objects per transaction
+        
+    Returns:
+        Number of objects written
+        
+    Raises:
+        ValueError: If batch_size is not positive
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    
+    objects = objects if isinstance(objects, list) else list(objects)
+    store = box._store
+    for start in range(0, len(objects), batch_size):
+        with store.write_tx():
+            box.put(objects[start:start + batch_size])
+    return len(objects)
+
+
+def paged_find(query: Query, page: int = 0, page_size: int = QUERY_PAGE_SIZE) -> list[Any]:
+    """
+    Fetch one page of a query's results.
+    
+    The query's offset and limit are reset afterwards, so the same built
+    query can be reused for other pages or a plain find().
+    
+    Args:
+        query: Built ObjectBox query
+        page: Zero-based page number
+        page_size: Objects per page
+        
+    Returns:
+        Objects on the requested page (empty past the last page)
+        
+    Raises:
+        ValueError: If page is negative or page_size is not positive
+    """
+    if page < 0:
+        raise ValueError("page must not be negative")
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    
+    query.offset(page * page_size)
+    query.limit(page_size)
+    try:
+        return query.find()
+    finally:
+        query.offset(0)
+        query.limit(0)
+
+
+def iter_all(query: Query, page_size: int = QUERY_PAGE_SIZE) -> Iterator[Any]:
+    """
+    Iterate over all results of a query one page at a time.
+    
+    Only a single page is held in memory at once, so result sets of any size
+    can be walked with bounded memory. Each page is read in its own
+    transaction; objects written while iterating may be skipped or seen twice.
+    
+    Args:
+        query: Built ObjectBox query
+        page_size: Objects fetched per page
+        
+    Yields:
+        Matching objects in query order
+    """
+    page = 0
+    while True:
+        results = paged_find(query, page, page_size)
+        yield from results
+        if len(results) < page_size:
+            return
+        page += 1
+
+
 class DatabaseHealthCheck:
     """Utility class for database health monitoring."""
     
+    # (store, expiry on the monotonic clock, stats) of the last get_database_stats
+    _stats_cache: tuple[Store, float, dict[str, Any]] | None = None
+    
     @staticmethod
     def check_connection() -> bool:
         """
         Check if database connection is healthy.
         
+        Opens the database on demand if nothing has used it yet.
+        
         Returns:
             True if connection is healthy, False otherwise
         """
@@ -205,25 +471,42 @@ class DatabaseHealthCheck:
             return False
     
     @staticmethod
-    def get_database_stats() -> Dict[str, Any]:
+    def get_database_stats() -> dict[str, Any]:
         """
         Get database statistics and information.
         
+        Results are reused for STATS_TTL_SECONDS per Store, so a frequently
+        polled stats endpoint does not measure the database on every call.
+        
         Returns:
             Dictionary with database statistics
         """
         try:
             store = get_database()
-            config = db_manager.get_config()
             
+            cached = DatabaseHealthCheck._stats_cache
+            if cached is not None and cached[0] is store and cached[1] > time.monotonic():
+                return dict(cached[2])
+            
+            # One size() call doubles as the health check
+            try:
+                size = store.size() if store else 0
+                healthy = True
+            except Exception as e:
+                logger.error(f"Database health check failed: {e}")
+                size = 0
+                healthy = False
+            
+            config = db_manager.get_config()
             stats = {
                 "is_initialized": db_manager.is_initialized(),
                 "database_path": config.db_path if config else None,
-                "database_size": store.size() if store else 0,
-                "connection_healthy": DatabaseHealthCheck.check_connection()
+                "database_size": size,
+                "connection_healthy": healthy
             }
             
-            return stats
+            DatabaseHealthCheck._stats_cache = (store, time.monotonic() + STATS_TTL_SECONDS, stats)
+            return dict(stats)
             
         except Exception as e:
             logger.error(f"Failed to get database stats: {e}")
@@ -237,7 +520,7 @@ class DatabaseHealthCheck:
 
 
 # Utility functions for common database operations
-def ensure_database_initialized(config: Optional[DatabaseConfig] = None):
+def ensure_database_initialized(config: DatabaseConfig | None = None):
     """
     Ensure database is initialized, initialize if not.
     
@@ -248,7 +531,7 @@ def ensure_database_initialized(config: Optional[DatabaseConfig] = None):
         initialize_database(config)
 
 
-def reset_database(config: Optional[DatabaseConfig] = None):
+def reset_database(config: DatabaseConfig | None = None):
     """
     Reset the database by closing and reinitializing.
     
@@ -1,5 +0,0 @@
-from objectbox.model import Entity
-
-@Entity()
-class Student:
-    name:
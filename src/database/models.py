@@ -10,44 +10,73 @@ This module defines the core data entities used throughout the platform:
 All entities use proper ObjectBox decorators and field types for database persistence.
 """
 
-from datetime import datetime
-from objectbox import Entity, Id, String, Int64, Float64, Date, Float32Vector
-from objectbox.model import Property
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from objectbox import Entity, Id, String, Int64, Float64, Date, Float32Vector, HnswIndex, Index, VectorDistanceType
+from objectbox.model.properties import IndexType
+
+__all__ = [
+    "Student",
+    "Interaction",
+    "LearningProgress",
+    "CurriculumContent",
+    "EMBEDDING_DIMENSIONS",
+    "COMPLETED_PERCENTAGE",
+    "MULTIMODAL_INPUT_TYPES",
+    "touch_updated_at",
+]
+
+# Dimensionality of curriculum content embeddings (Ollama embedding models used by RAG)
+EMBEDDING_DIMENSIONS = 768
+
+# Interaction input types that count as multimodal
+MULTIMODAL_INPUT_TYPES = frozenset(('voice', 'image'))
+
+# completion_percentage at which a topic counts as completed
+COMPLETED_PERCENTAGE = 100.0
+
+
+def _now_ms() -> int:
+    """Current time in epoch milliseconds (integer math, no datetime/float round-trip)."""
+    return time.time_ns() // 1_000_000
 
 
 @Entity()
 class Student:
     """Student entity representing a learner in the platform."""
-    id = Id
-    name = String
-    email = String
-    learning_preferences = String
-    created_at = Int64
-    updated_at = Int64
-
-def update_preferences(self, preferences: str):
+    id = Id(id=1, uid=1001)
+    name = String(id=2, uid=1002)
+    # Hash index: email is only ever matched exactly (find_by_email)
+    email = String(id=3, uid=1003, index=Index(IndexType.HASH))
+    learning_preferences = String(id=4, uid=1004)
+    created_at = Int64(id=5, uid=1005)
+    updated_at = Int64(id=6, uid=1006)
+
+    def update_preferences(self, preferences: str, now_ms: int | None = None):
         """Update learning preferences and timestamp."""
         self.learning_preferences = preferences
-        self.updated_at = int(datetime.now().timestamp() * 1000)
+        self.updated_at = now_ms or _now_ms()
 
-def __str__(self):
-    return f"Student(id={self.id}, name='{self.name}', email='{self.email}')"
+    def __str__(self):
+        return f"Student(id={self.id}, name='{self.name}', email='{self.email}')"
 
 
 @Entity()
 class Interaction:
     """Interaction entity representing student interactions with agents."""
-    id = Id
-    student_id = Property(int, id=2, uid=2002, index=True)
-    input_type = Property(str, id=3, uid=2003)
-    input_content = Property(str, id=4, uid=2004)
-    agent_response = Property(str, id=5, uid=2005)
-    timestamp = Date
-    session_id = Property(str, id=7, uid=2007, index=True)
+    id = Id(id=1, uid=2001)
+    student_id = Int64(id=2, uid=2002, index=Index())
+    input_type = String(id=3, uid=2003, index=Index())
+    input_content = String(id=4, uid=2004)
+    agent_response = String(id=5, uid=2005)
+    timestamp = Date(int, id=6, uid=2006)
+    session_id = String(id=7, uid=2007, index=Index())
 
     def is_multimodal(self) -> bool:
         """Check if interaction involves multimodal input."""
-        return self.input_type in ['voice', 'image']
+        return self.input_type in MULTIMODAL_INPUT_TYPES
 
     def __str__(self):
         return f"Interaction(id={self.id}, student_id={self.student_id}, type='{self.input_type}')"
@@ -57,12 +86,16 @@ class Interaction:
 class LearningProgress:
     """Learning progress entity tracking student advancement."""
     id= Id(id=1, uid=3001)
-    student_id= Property(int, id=2, uid=3002, index=True)
-    subject = Property(str, id=3, uid=3003, index=True)
-    topic= Property(str, id=4, uid=3004, index=True)
+    student_id= Int64(id=2, uid=3002, index=Index())
+    subject = String(id=3, uid=3003, index=Index())
+    topic= String(id=4, uid=3004, index=Index())
     completion_percentage = Float64(id=5, uid=3005)
-    last_accessed = Date
-    performance_score= Property(float, id=7, uid=3007)
+    last_accessed = Date(int, id=6, uid=3006)
+    performance_score= Float64(id=7, uid=3007)
+
+    def is_completed(self) -> bool:
+        """Check if the topic has been fully completed."""
+        return self.completion_percentage >= COMPLETED_PERCENTAGE
 
 
 
@@ -70,11 +103,34 @@ class LearningProgress:
 class CurriculumContent:
     """Curriculum content entity with basic structure."""
     id= Id(id=1, uid=4001)
-    title = Property(str, id=2, uid=4002, index=True)
-    content = Property(str, id=3, uid=4003)
-    subject = Property(str, id=4, uid=4004, index=True)
-    difficulty_level = Property(int, id=5, uid=4005, index=True)
-    content_type = Property(str, id=6, uid=4006)
-    created_at = Property(int, id=7, uid=4007)
-    updated_at = Property(int, id=8, uid=4008)
-    vector_embedding: Float32Vector = Float32Vector(id=9, uid=4009)
+    title = String(id=2, uid=4002, index=Index())
+    content = String(id=3, uid=4003)
+    subject = String(id=4, uid=4004, index=Index())
+    difficulty_level = Int64(id=5, uid=4005, index=Index())
+    content_type = String(id=6, uid=4006)
+    created_at = Int64(id=7, uid=4007)
+    updated_at = Int64(id=8, uid=4008)
+    # HNSW index so nearest_neighbor queries are approximate O(log N) lookups
+    vector_embedding: Float32Vector = Float32Vector(
+        id=9, uid=4009,
+        index=HnswIndex(
+            dimensions=EMBEDDING_DIMENSIONS,
+            neighbors_per_node=16,
+            indexing_search_count=200,
+            distance_type=VectorDistanceType.COSINE
+        )
+    )
+
+
+def touch_updated_at(entities: Iterable, now_ms: int | None = None) -> int:
+    """
+    Stamp updated_at on a batch of entities (e.g. Student, CurriculumContent)
+    with one shared timestamp, computed once for the whole batch.
+
+    Returns:
+        The timestamp used, in epoch milliseconds
+    """
+    now_ms = now_ms or _now_ms()
+    for entity in entities:
+        entity.updated_at = now_ms
+    return now_ms
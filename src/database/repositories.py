@@ -9,41 +9,100 @@ This module provides:
 """
 
 import logging
-from typing import List, Optional, Dict, Any, TypeVar, Generic, Type
+import threading
+from functools import reduce
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple, TypeVar, Generic, Type, Union
 from abc import ABC, abstractmethod
 from datetime import datetime
+import numpy as np
+from objectbox.query import Query
 
-from .models import Student, Interaction, LearningProgress, CurriculumContent
-from .connection import get_database, database_transaction
+from .models import (
+    Student, Interaction, LearningProgress, CurriculumContent, EMBEDDING_DIMENSIONS, COMPLETED_PERCENTAGE,
+    MULTIMODAL_INPUT_TYPES
+)
+from .connection import get_database, database_transaction, bulk_put, iter_all, QUERY_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
 # Generic type for entity models
 T = TypeVar('T')
 
+# Query vectors may be plain lists or (preferably) float32 arrays
+Vector = Union[List[float], np.ndarray]
+
+# Objects put per call by bulk_upsert; all chunks share one transaction
+BULK_UPSERT_CHUNK_SIZE = 10000
+
+# ObjectBox applies extra conditions to the nearest neighbors it found, so
+# filtered similarity searches fetch this many times more candidates
+SIMILARITY_FILTER_OVERSAMPLING = 10
+
+
+def _as_vector(query_vector: Vector) -> np.ndarray:
+    """
+    Convert a query vector to the contiguous float32 array the HNSW index searches with.
+    
+    A float32 array that is already contiguous is passed through without a copy.
+    """
+    return np.ascontiguousarray(query_vector, dtype=np.float32)
+
 
 class BaseRepository(Generic[T], ABC):
     """Base repository class providing common CRUD operations."""
     
     def __init__(self, entity_class: Type[T]):
         self.entity_class = entity_class
+        # @Entity wraps the model class; the class name lives on the wrapped type
+        self.entity_name = getattr(entity_class, "_user_type", entity_class).__name__
         self._store = None
         self._box = None
+        # Guards the one-time Store/Box lookup; repositories are shared by
+        # every request thread
+        self._lock = threading.Lock()
+        # Built queries by shape, per thread: a Query's bound parameters are
+        # shared state, so threads must not rebind each other's
+        self._queries = threading.local()
     
     @property
     def store(self):
         """Get ObjectBox Store instance."""
         if self._store is None:
-            self._store = get_database()
+            with self._lock:
+                if self._store is None:
+                    self._store = get_database()
         return self._store
     
     @property
     def box(self):
         """Get ObjectBox Box instance for the entity."""
         if self._box is None:
-            self._box = self.store.box(self.entity_class)
+            store = self.store
+            with self._lock:
+                if self._box is None:
+                    self._box = store.box(self.entity_class)
         return self._box
     
+    def _cached_query(self, shape: str, build: Callable[[], Query]) -> Query:
+        """
+        Get the built query for a predicate shape, building it on first use.
+        
+        Callers bind the actual values with the query's set_parameter_*
+        methods before running it, so each shape is only built once per thread.
+        
+        Args:
+            shape: Name identifying the predicate shape
+            build: Builds the query with placeholder values
+            
+        Returns:
+            Built ObjectBox query
+        """
+        query = getattr(self._queries, shape, None)
+        if query is None:
+            query = build()
+            setattr(self._queries, shape, query)
+        return query
+    
     def create(self, entity: T) -> T:
         """
         Create a new entity in the database.
@@ -55,13 +114,13 @@ class BaseRepository(Generic[T], ABC):
             Created entity with assigned ID
         """
         try:
-            with database_transaction():
+            with database_transaction("write"):
                 entity_id = self.box.put(entity)
                 entity.id = entity_id
-                logger.debug(f"Created {self.entity_class.__name__} with ID {entity_id}")
+                logger.debug("Created %s with ID %s", self.entity_name, entity_id)
                 return entity
-        except Exception as e:
-            logger.error(f"Failed to create {self.entity_class.__name__}: {e}")
+        except Exception:
+            logger.error("Failed to create %s", self.entity_name, exc_info=True)
             raise
     
     def get_by_id(self, entity_id: int) -> Optional[T]:
@@ -76,10 +135,30 @@ class BaseRepository(Generic[T], ABC):
         """
         try:
             return self.box.get(entity_id)
-        except Exception as e:
-            logger.error(f"Failed to get {self.entity_class.__name__} by ID {entity_id}: {e}")
+        except Exception:
+            logger.error("Failed to get %s by ID %s", self.entity_name, entity_id, exc_info=True)
             return None
     
+    def get_many(self, entity_ids: List[int]) -> List[Optional[T]]:
+        """
+        Retrieve several entities by ID from one consistent snapshot.
+        
+        All lookups share a single read transaction instead of each opening
+        its own.
+        
+        Args:
+            entity_ids: Entity IDs
+            
+        Returns:
+            Entities in the order of entity_ids, None where not found
+        """
+        try:
+            with database_transaction("read"):
+                return [self.box.get(entity_id) for entity_id in entity_ids]
+        except Exception:
+            logger.error("Failed to get %s by IDs", self.entity_name, exc_info=True)
+            return [None] * len(entity_ids)
+    
     def get_all(self) -> List[T]:
         """
         Retrieve all entities.
@@ -89,8 +168,8 @@ class BaseRepository(Generic[T], ABC):
         """
         try:
             return self.box.get_all()
-        except Exception as e:
-            logger.error(f"Failed to get all {self.entity_class.__name__}: {e}")
+        except Exception:
+            logger.error("Failed to get all %s", self.entity_name, exc_info=True)
             return []
     
     def update(self, entity: T) -> T:
@@ -104,12 +183,12 @@ class BaseRepository(Generic[T], ABC):
             Updated entity
         """
         try:
-            with database_transaction():
+            with database_transaction("write"):
                 self.box.put(entity)
-                logger.debug(f"Updated {self.entity_class.__name__} with ID {entity.id}")
+                logger.debug("Updated %s with ID %s", self.entity_name, entity.id)
                 return entity
-        except Exception as e:
-            logger.error(f"Failed to update {self.entity_class.__name__}: {e}")
+        except Exception:
+            logger.error("Failed to update %s", self.entity_name, exc_info=True)
             raise
     
     def delete(self, entity_id: int) -> bool:
@@ -123,10 +202,10 @@ class BaseRepository(Generic[T], ABC):
             True if deleted successfully, False otherwise
         """
         try:
-            with database_transaction():
+            with database_transaction("write"):
                 return self.box.remove(entity_id)
-        except Exception as e:
-            logger.error(f"Failed to delete {self.entity_class.__name__} with ID {entity_id}: {e}")
+        except Exception:
+            logger.error("Failed to delete %s with ID %s", self.entity_name, entity_id, exc_info=True)
             return False
     
     def count(self) -> int:
@@ -138,14 +217,19 @@ class BaseRepository(Generic[T], ABC):
         """
         try:
             return self.box.count()
-        except Exception as e:
-            logger.error(f"Failed to count {self.entity_class.__name__}: {e}")
+        except Exception:
+            logger.error("Failed to count %s", self.entity_name, exc_info=True)
             return 0
 
     def create_many(self, entities: List[T]) -> List[T]:
         """
         Create multiple new entities in the database.
         
+        Entities are written in batches, one transaction per batch (see
+        bulk_put), so no write lock is held for the whole list. If a batch
+        fails, the batches before it stay committed; use bulk_upsert to write
+        all or nothing.
+        
         Args:
             entities: List of entity instances to create
             
@@ -153,12 +237,42 @@ class BaseRepository(Generic[T], ABC):
             List of created entities with assigned IDs
         """
         try:
-            with database_transaction():
-                self.box.put(entities)
-                logger.debug(f"Created {len(entities)} {self.entity_class.__name__} entities")
-                return entities
-        except Exception as e:
-            logger.error(f"Failed to create multiple {self.entity_class.__name__} entities: {e}")
+            bulk_put(self.box, entities)
+            logger.debug("Created %s %s entities", len(entities), self.entity_name)
+            return entities
+        except Exception:
+            logger.error("Failed to create multiple %s entities", self.entity_name, exc_info=True)
+            raise
+    
+    def bulk_upsert(self, entities: List[T], chunk: int = BULK_UPSERT_CHUNK_SIZE) -> int:
+        """
+        Insert or update many entities in a single write transaction.
+        
+        Entities are put `chunk` at a time, so the commit is paid once for the
+        whole list while each put call stays bounded. New entities get their
+        IDs assigned in place.
+        
+        Args:
+            entities: Entity instances to insert or update
+            chunk: Entities per put call
+            
+        Returns:
+            Number of entities written
+            
+        Raises:
+            ValueError: If chunk is not positive
+        """
+        if chunk < 1:
+            raise ValueError("chunk must be positive")
+        
+        try:
+            with database_transaction("write"):
+                for start in range(0, len(entities), chunk):
+                    self.box.put(entities[start:start + chunk])
+                logger.debug("Upserted %s %s entities", len(entities), self.entity_name)
+                return len(entities)
+        except Exception:
+            logger.error("Failed to upsert multiple %s entities", self.entity_name, exc_info=True)
             raise
     
     def delete_many(self, entity_ids: List[int]) -> bool:
@@ -172,12 +286,14 @@ class BaseRepository(Generic[T], ABC):
             True if deleted successfully, False otherwise
         """
         try:
-            with database_transaction():
-                self.box.remove(entity_ids)
-                logger.debug(f"Deleted {len(entity_ids)} {self.entity_class.__name__} entities")
+            with database_transaction("write"):
+                # Box.remove takes a single ID; one transaction covers them all
+                for entity_id in entity_ids:
+                    self.box.remove(entity_id)
+                logger.debug("Deleted %s %s entities", len(entity_ids), self.entity_name)
                 return True
-        except Exception as e:
-            logger.error(f"Failed to delete multiple {self.entity_class.__name__} entities: {e}")
+        except Exception:
+            logger.error("Failed to delete multiple %s entities", self.entity_name, exc_info=True)
             return False
 
 
@@ -198,10 +314,14 @@ class StudentRepository(BaseRepository[Student]):
             Student instance or None if not found
         """
         try:
-            query = self.box.query(Student.email.equals(email)).build()
-            return query.find_first()
-        except Exception as e:
-            logger.error(f"Failed to find student by email {email}: {e}")
+            query = self._cached_query(
+                "email", lambda: self.box.query(Student.email.equals("", case_sensitive=True)).build()
+            )
+            query.set_parameter_string(Student.email, email)
+            students = query.find()
+            return students[0] if students else None
+        except Exception:
+            logger.error("Failed to find student by email %s", email, exc_info=True)
             return None
     
     def find_by_name_pattern(self, name_pattern: str) -> List[Student]:
@@ -217,8 +337,8 @@ class StudentRepository(BaseRepository[Student]):
         try:
             query = self.box.query(Student.name.contains(name_pattern)).build()
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find students by name pattern {name_pattern}: {e}")
+        except Exception:
+            logger.error("Failed to find students by name pattern %s", name_pattern, exc_info=True)
             return []
 
 
@@ -239,12 +359,52 @@ class InteractionRepository(BaseRepository[Interaction]):
             List of interactions for the student
         """
         try:
-            query = self.box.query(Interaction.student_id.equals(student_id)).build()
+            query = self._cached_query(
+                "student_id", lambda: self.box.query(Interaction.student_id.equals(0)).build()
+            )
+            query.set_parameter_int(Interaction.student_id, student_id)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find interactions for student {student_id}: {e}")
+        except Exception:
+            logger.error("Failed to find interactions for student %s", student_id, exc_info=True)
             return []
     
+    def find_ids_by_student_id(self, student_id: int) -> List[int]:
+        """
+        Find the IDs of all interactions for a student, without loading them.
+        
+        Args:
+            student_id: Student ID
+            
+        Returns:
+            List of interaction IDs
+        """
+        try:
+            query = self._cached_query(
+                "student_id", lambda: self.box.query(Interaction.student_id.equals(0)).build()
+            )
+            query.set_parameter_int(Interaction.student_id, student_id)
+            return query.find_ids()
+        except Exception:
+            logger.error("Failed to find interaction IDs for student %s", student_id, exc_info=True)
+            return []
+    
+    def iter_by_student_id(self, student_id: int) -> Iterator[Interaction]:
+        """
+        Iterate over all interactions for a student, one page at a time.
+        
+        Only a page of interactions is loaded at once (see iter_all), so
+        students with long histories can be scanned with bounded memory.
+        
+        Args:
+            student_id: Student ID
+            
+        Yields:
+            Interactions of the student
+        """
+        # A dedicated query: the cached one could be rebound mid-iteration
+        query = self.box.query(Interaction.student_id.equals(student_id)).build()
+        yield from iter_all(query)
+    
     def find_by_session_id(self, session_id: str) -> List[Interaction]:
         """
         Find all interactions in a specific session.
@@ -256,12 +416,23 @@ class InteractionRepository(BaseRepository[Interaction]):
             List of interactions in the session
         """
         try:
-            query = self.box.query(Interaction.session_id.equals(session_id)).build()
+            query = self._cached_query(
+                "session_id", lambda: self.box.query(Interaction.session_id.equals("")).build()
+            )
+            query.set_parameter_string(Interaction.session_id, session_id)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find interactions for session {session_id}: {e}")
+        except Exception:
+            logger.error("Failed to find interactions for session %s", session_id, exc_info=True)
             return []
     
+    @staticmethod
+    def _multimodal_condition():
+        """Match any multimodal input type; each equals() is served by the input_type index."""
+        return reduce(
+            lambda condition, other: condition.or_(other),
+            [Interaction.input_type.equals(input_type) for input_type in sorted(MULTIMODAL_INPUT_TYPES)]
+        )
+    
     def find_multimodal_interactions(self, student_id: Optional[int] = None) -> List[Interaction]:
         """
         Find multimodal interactions (voice/image input).
@@ -273,14 +444,21 @@ class InteractionRepository(BaseRepository[Interaction]):
             List of multimodal interactions
         """
         try:
-            query_builder = self.box.query()
-            query_builder.any_of([Interaction.input_type.equals('voice'), Interaction.input_type.equals('image')])
-            if student_id is not None:
-                query_builder.and_(Interaction.student_id.equals(student_id))
-            query = query_builder.build()
+            if student_id is None:
+                query = self._cached_query(
+                    "multimodal", lambda: self.box.query(self._multimodal_condition()).build()
+                )
+            else:
+                query = self._cached_query(
+                    "multimodal_student_id",
+                    lambda: self.box.query(
+                        self._multimodal_condition().and_(Interaction.student_id.equals(0))
+                    ).build()
+                )
+                query.set_parameter_int(Interaction.student_id, student_id)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find multimodal interactions: {e}")
+        except Exception:
+            logger.error("Failed to find multimodal interactions", exc_info=True)
             return []
 
 
@@ -301,10 +479,13 @@ class LearningProgressRepository(BaseRepository[LearningProgress]):
             List of learning progress records
         """
         try:
-            query = self.box.query(LearningProgress.student_id.equals(student_id)).build()
+            query = self._cached_query(
+                "student_id", lambda: self.box.query(LearningProgress.student_id.equals(0)).build()
+            )
+            query.set_parameter_int(LearningProgress.student_id, student_id)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find progress for student {student_id}: {e}")
+        except Exception:
+            logger.error("Failed to find progress for student %s", student_id, exc_info=True)
             return []
     
     def find_by_subject(self, subject: str, student_id: Optional[int] = None) -> List[LearningProgress]:
@@ -319,13 +500,22 @@ class LearningProgressRepository(BaseRepository[LearningProgress]):
             List of learning progress records
         """
         try:
-            query_builder = self.box.query(LearningProgress.subject.equals(subject))
-            if student_id is not None:
-                query_builder.and_(LearningProgress.student_id.equals(student_id))
-            query = query_builder.build()
+            if student_id is None:
+                query = self._cached_query(
+                    "subject", lambda: self.box.query(LearningProgress.subject.equals("")).build()
+                )
+            else:
+                query = self._cached_query(
+                    "subject_student_id",
+                    lambda: self.box.query(
+                        LearningProgress.subject.equals("").and_(LearningProgress.student_id.equals(0))
+                    ).build()
+                )
+                query.set_parameter_int(LearningProgress.student_id, student_id)
+            query.set_parameter_string(LearningProgress.subject, subject)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find progress for subject {subject}: {e}")
+        except Exception:
+            logger.error("Failed to find progress for subject %s", subject, exc_info=True)
             return []
     
     def find_completed_topics(self, student_id: int) -> List[LearningProgress]:
@@ -339,10 +529,15 @@ class LearningProgressRepository(BaseRepository[LearningProgress]):
             List of completed learning progress records
         """
         try:
-            student_progress = self.find_by_student_id(student_id)
-            return [p for p in student_progress if p.is_completed()]
-        except Exception as e:
-            logger.error(f"Failed to find completed topics for student {student_id}: {e}")
+            # Filter in the store rather than loading every progress row
+            query = self.box.query(
+                LearningProgress.student_id.equals(student_id).and_(
+                    LearningProgress.completion_percentage.greater_or_equal(COMPLETED_PERCENTAGE)
+                )
+            ).build()
+            return query.find()
+        except Exception:
+            logger.error("Failed to find completed topics for student %s", student_id, exc_info=True)
             return []
 
 
@@ -363,10 +558,33 @@ class CurriculumContentRepository(BaseRepository[CurriculumContent]):
             List of curriculum content for the subject
         """
         try:
-            query = self.box.query(CurriculumContent.subject.equals(subject)).build()
+            query = self._cached_query(
+                "subject", lambda: self.box.query(CurriculumContent.subject.equals("")).build()
+            )
+            query.set_parameter_string(CurriculumContent.subject, subject)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find content for subject {subject}: {e}")
+        except Exception:
+            logger.error("Failed to find content for subject %s", subject, exc_info=True)
+            return []
+    
+    def find_ids_by_subject(self, subject: str) -> List[int]:
+        """
+        Find the IDs of curriculum content for a subject, without loading it.
+        
+        Args:
+            subject: Subject name
+            
+        Returns:
+            List of curriculum content IDs
+        """
+        try:
+            query = self._cached_query(
+                "subject", lambda: self.box.query(CurriculumContent.subject.equals("")).build()
+            )
+            query.set_parameter_string(CurriculumContent.subject, subject)
+            return query.find_ids()
+        except Exception:
+            logger.error("Failed to find content IDs for subject %s", subject, exc_info=True)
             return []
     
     def find_by_difficulty_level(self, min_level: int, max_level: int) -> List[CurriculumContent]:
@@ -381,12 +599,20 @@ class CurriculumContentRepository(BaseRepository[CurriculumContent]):
             List of curriculum content in the difficulty range
         """
         try:
-            query = self.box.query(
-                CurriculumContent.difficulty_level.between(min_level, max_level)
-            ).build()
+            # Two aliased bounds: a between() condition cannot be rebound
+            query = self._cached_query(
+                "difficulty_level",
+                lambda: self.box.query(
+                    CurriculumContent.difficulty_level.greater_or_equal(0).alias("min_level").and_(
+                        CurriculumContent.difficulty_level.less_or_equal(0).alias("max_level")
+                    )
+                ).build()
+            )
+            query.set_parameter_alias_int("min_level", min_level)
+            query.set_parameter_alias_int("max_level", max_level)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find content by difficulty level: {e}")
+        except Exception:
+            logger.error("Failed to find content by difficulty level", exc_info=True)
             return []
     
     def find_advanced_content(self, subject: Optional[str] = None) -> List[CurriculumContent]:
@@ -400,13 +626,21 @@ class CurriculumContentRepository(BaseRepository[CurriculumContent]):
             List of advanced curriculum content
         """
         try:
-            query_builder = self.box.query(CurriculumContent.difficulty_level.greater(7))
-            if subject is not None:
-                query_builder.and_(CurriculumContent.subject.equals(subject))
-            query = query_builder.build()
+            if subject is None:
+                query = self._cached_query(
+                    "advanced", lambda: self.box.query(CurriculumContent.difficulty_level.greater_than(7)).build()
+                )
+            else:
+                query = self._cached_query(
+                    "advanced_subject",
+                    lambda: self.box.query(
+                        CurriculumContent.difficulty_level.greater_than(7).and_(CurriculumContent.subject.equals(""))
+                    ).build()
+                )
+                query.set_parameter_string(CurriculumContent.subject, subject)
             return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find advanced content: {e}")
+        except Exception:
+            logger.error("Failed to find advanced content", exc_info=True)
             return []
     
     def find_with_embeddings(self) -> List[CurriculumContent]:
@@ -417,33 +651,118 @@ class CurriculumContentRepository(BaseRepository[CurriculumContent]):
             List of curriculum content with embeddings
         """
         try:
-            # ObjectBox automatically handles non-null checks for vector properties
-            # We can query for entities where the vector_embedding property is not null
-            query = self.box.query(CurriculumContent.vector_embedding.not_null()).build()
-            return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find content with embeddings: {e}")
+            # Vector properties cannot be queried for presence; skip empty ones
+            query = self.box.query().build()
+            return [content for content in iter_all(query) if len(content.vector_embedding)]
+        except Exception:
+            logger.error("Failed to find content with embeddings", exc_info=True)
             return []
     
-    def find_similar_content(self, query_vector: List[float], max_results: int = 10) -> List[CurriculumContent]:
+    def iter_embeddings(self, page_size: int = QUERY_PAGE_SIZE) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Iterate over all stored embeddings as (content ID, float32 vector) pairs.
+        
+        Content is read a page at a time and only the ID and vector are kept,
+        so exporting or re-indexing every embedding runs in bounded memory.
+        Content without an embedding is skipped.
+        
+        Args:
+            page_size: Content loaded per page
+            
+        Yields:
+            (content ID, embedding) pairs in ID order
+        """
+        query = self.box.query().build()
+        for content in iter_all(query, page_size):
+            if len(content.vector_embedding):
+                yield content.id, content.vector_embedding
+    
+    def _find_similar(self, query_vector: Vector, max_results: int, subject: Optional[str],
+                      difficulty_range: Optional[Tuple[int, int]]) -> List[Tuple[CurriculumContent, float]]:
+        """Run a nearest-neighbor query with any filters ANDed in; (content, distance) pairs, closest first."""
+        filters = []
+        if subject is not None:
+            filters.append(CurriculumContent.subject.equals(subject))
+        if difficulty_range is not None:
+            filters.append(CurriculumContent.difficulty_level.between(*difficulty_range))
+        
+        candidates = max_results * SIMILARITY_FILTER_OVERSAMPLING if filters else max_results
+        condition = CurriculumContent.vector_embedding.nearest_neighbor(_as_vector(query_vector), candidates)
+        for query_filter in filters:
+            condition = condition.and_(query_filter)
+        return self.box.query(condition).build().find_with_scores()[:max_results]
+    
+    def find_similar_content(self, query_vector: Vector, max_results: int = 10,
+                             subject: Optional[str] = None,
+                             difficulty_range: Optional[Tuple[int, int]] = None) -> List[CurriculumContent]:
         """
         Find curriculum content similar to the query vector using vector search.
         
+        Filters are part of the query, so ObjectBox returns the nearest
+        matching content rather than the nearest content overall.
+        
         Args:
             query_vector: Query vector for similarity search
             max_results: Maximum number of results to return
+            subject: Optional subject to restrict results to
+            difficulty_range: Optional inclusive (min, max) difficulty level
             
         Returns:
             List of similar curriculum content ordered by similarity
         """
         try:
-            # Use ObjectBox vector search capabilities
-            # The nearest_neighbor method performs the vector similarity search
-            query = self.box.query(CurriculumContent.vector_embedding.nearest_neighbor(query_vector, max_results)).build()
-            return query.find()
-        except Exception as e:
-            logger.error(f"Failed to find similar content: {e}")
+            return [content for content, _ in self._find_similar(query_vector, max_results, subject, difficulty_range)]
+        except Exception:
+            logger.error("Failed to find similar content", exc_info=True)
             return []
+    
+    def find_similar_content_with_scores(self, query_vector: Vector, max_results: int = 10,
+                                         subject: Optional[str] = None,
+                                         difficulty_range: Optional[Tuple[int, int]] = None
+                                         ) -> List[Tuple[CurriculumContent, float]]:
+        """
+        Find the nearest curriculum content through the HNSW index, with distances.
+        
+        Args:
+            query_vector: Query vector for similarity search
+            max_results: Maximum number of results to return
+            subject: Optional subject to restrict results to
+            difficulty_range: Optional inclusive (min, max) difficulty level
+            
+        Returns:
+            List of (content, cosine distance) pairs, closest first
+        """
+        try:
+            return self._find_similar(query_vector, max_results, subject, difficulty_range)
+        except Exception:
+            logger.error("Failed to find similar content", exc_info=True)
+            return []
+    
+    def load_embedding_matrix(self, content_ids: List[int]) -> np.ndarray:
+        """
+        Load the embeddings of the given content as one contiguous matrix.
+        
+        Row i holds the embedding of content_ids[i], so ranking a batch
+        against a query is a single `matrix @ query_vector`. Content that
+        does not exist or has no embedding gets a zero row.
+        
+        Args:
+            content_ids: IDs of the curriculum content to load
+            
+        Returns:
+            float32 array of shape (len(content_ids), EMBEDDING_DIMENSIONS)
+        """
+        matrix = np.zeros((len(content_ids), EMBEDDING_DIMENSIONS), dtype=np.float32)
+        try:
+            # One read transaction gives a consistent snapshot for the whole batch
+            with database_transaction("read"):
+                for row, content_id in enumerate(content_ids):
+                    content = self.box.get(content_id)
+                    if content is not None and len(content.vector_embedding):
+                        matrix[row] = content.vector_embedding
+        except Exception:
+            logger.error("Failed to load embedding matrix", exc_info=True)
+        return matrix
 
 
 
@@ -5,87 +5,189 @@ import logging
 import logging.config
 from pathlib import Path
 import sys
+import threading
+import uuid
+from collections import OrderedDict
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import get_config, ensure_directories
+from config import get_config, ensure_directories, start_log_listener
 from utils import call_agent_async
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import os
+# orjson parses and serializes request/response bodies considerably faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 ##from agents.history.historyAgent import HistoryAgent
 from agents.router.agentRouter import AgentRouter
 from agents.analytics.node import AnalyticsAgentBase
 from agents.response.responseAgentADK import ResponseAgentADK
-from agents.analytics.analyticsAgentADK import AnalyticsAgent
+from agents.analytics.analyticsAgentADK import get_analytics_agent
 from agents.curriculum.curriculumAgent import CurriculumAgent
 from agents.planning.planningAgentADK import PlanningAgent
 
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.models import Gemini
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; used for get_json() and jsonify()"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Gemini context caching for the agents' static description/instruction prefix;
+# ADK creates the cache from the second turn once the prefix is large enough
+CONTEXT_CACHE_CONFIG = ContextCacheConfig(ttl_seconds=3600, cache_intervals=20)
 
 def setup_logging():
     """Setup logging configuration"""
     config = get_config()
     logging.config.dictConfig(config["logging"])
+    start_log_listener()
     return logging.getLogger(__name__)
 
 # Initialize logging and directories at module level
 ensure_directories()
 logger = setup_logging()
 
+# Read once at startup so a missing key fails here, not on the first request;
+# the Gemini client picks the key up from the environment
+GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
+if not GOOGLE_API_KEY:
+    raise RuntimeError("GOOGLE_API_KEY environment variable is not set")
+
+# One Gemini model object shared by the agents built here, so they share its
+# API client instead of each resolving the model name to its own
+GEMINI_MODEL = Gemini(model="gemini-2.0-flash")
+
+# Define constants for identifying the interaction context
+APP_NAME = "weather_tutorial_app"
+USER_ID = "user_1"
+# Sessions kept in the in-memory session service; beyond this many the least
+# recently used one is deleted
+MAX_SESSIONS = 1000
+
+# The agent tree, session service and runner do not depend on the request,
+# so they are built once per process and shared by every request
+router = AgentRouter(
+    name="MainRouter",
+    model=GEMINI_MODEL,
+    description="Routes response queries to Analytics, Curriculum, Planning or Response agents",
+    instruction=(
+        "Transfer queries to 'AnalyticsAgent' for analytics, 'CurriculumAgent' for curriculum help, "
+        "'PlanningAgent' for planning help or 'ResponseAgentADK' for text, image or audio output."
+    ),
+    sub_agents=[
+        get_analytics_agent(),
+        CurriculumAgent(model=GEMINI_MODEL),
+        PlanningAgent(model=GEMINI_MODEL),
+        ResponseAgentADK(model=GEMINI_MODEL)
+    ]
+)
+session_service = InMemorySessionService()
+# (user_id, session_id) pairs created in session_service, least recently used first
+_sessions: OrderedDict[tuple[str, str], None] = OrderedDict()
+_sessions_lock = threading.Lock()
+
+# --- Runner ---
+# Key Concept: Runner orchestrates the agent execution loop.
+runner = Runner(
+    app=App(
+        name=APP_NAME,   # Associates runs with our app
+        root_agent=router, # The agent we want to run
+        context_cache_config=CONTEXT_CACHE_CONFIG # Reuses the cached prompt prefix
+    ),
+    session_service=session_service # Uses our session manager
+)
+logger.info(f"Runner created for agent '{runner.agent.name}'.")
+
+async def ensure_session(user_id, session_id):
+    """Create the session on first use; evict the least recently used beyond MAX_SESSIONS"""
+    key = (user_id, session_id)
+    with _sessions_lock:
+        if key in _sessions:
+            _sessions.move_to_end(key)
+            return
+
+    try:
+        await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+        print(f"Session created: App='{APP_NAME}', User='{user_id}', Session='{session_id}'")
+    except AlreadyExistsError:
+        pass  # Created by a concurrent request
+
+    evicted = []
+    with _sessions_lock:
+        _sessions[key] = None
+        while len(_sessions) > MAX_SESSIONS:
+            evicted.append(_sessions.popitem(last=False)[0])
+    for old_user_id, old_session_id in evicted:
+        await session_service.delete_session(
+            app_name=APP_NAME,
+            user_id=old_user_id,
+            session_id=old_session_id
+        )
+
 @app.route('/entryPoint', methods=['POST'])
 async def pgvectordemo():
     logger.info('Entering into entryPoint')
     data = request.get_json()
     query = data['query']
+    user_id = data.get('user_id', USER_ID)
+    # Without an id the request starts a new conversation; the id is returned
+    # so the client can continue it
+    session_id = data.get('session_id') or uuid.uuid4().hex
 
-    router = AgentRouter(
-        name="MainRouter",
-        description="Routes response queries to Analytics, Curriculum, Planning or Response agents",
-        instruction=(
-            "Transfer queries to 'AnalyticsAgent' for analytics, 'CurriculumAgent' for curriculum help, "
-            "'PlanningAgent' for planning help or 'ResponseAgentADK' for text, image or audio output."
-        ),
-        sub_agents=[
-            AnalyticsAgent(),
-            CurriculumAgent,
-            PlanningAgent(),
-            ResponseAgentADK(query=query)
-        ]
-    )
     #rag = HistoryAgent()
     #response = rag.query(query)
-    session_service = InMemorySessionService()
-
-    # Define constants for identifying the interaction context
-    APP_NAME = "weather_tutorial_app"
-    USER_ID = "user_1"
-    SESSION_ID = "session_001" # Using a fixed ID for simplicity
-
-    # Create the specific session where the conversation will happen
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        session_id=SESSION_ID
-    )
-    print(f"Session created: App='{APP_NAME}', User='{USER_ID}', Session='{SESSION_ID}'")
-
-    # --- Runner ---
-    # Key Concept: Runner orchestrates the agent execution loop.
-    runner = Runner(
-        agent=router, # The agent we want to run
-        app_name=APP_NAME,   # Associates runs with our app
-        session_service=session_service # Uses our session manager
-    )
-    print(f"Runner created for agent '{runner.agent.name}'.")
-
-    output=await call_agent_async(query,runner,USER_ID,SESSION_ID)
+
+    # The shared session service keeps the session, so later requests with
+    # the same ids continue the conversation
+    await ensure_session(user_id, session_id)
+
+    output=await call_agent_async(query,runner,user_id,session_id)
 
     logger.info(f"router ---> {router}")
     logger.info('Returning from entryPoint')
 
 
-    return jsonify({'response': output})
+    return jsonify({'response': output, 'session_id': session_id})
+
+def run_server(application, options):
+    """Serve the Flask app with gunicorn, configured from SERVER_CONFIG"""
+    # Imported here so the FLASK_DEBUG development server does not need gunicorn
+    from gunicorn.app.base import BaseApplication
+
+    class PlatformServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return application
+
+    PlatformServer().run()
+
+
+def _restart_log_listener(server, worker):
+    """gunicorn post_fork hook: the log listener thread does not survive the fork"""
+    start_log_listener.cache_clear()
+    start_log_listener()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -95,7 +197,6 @@ def health_check():
 def main():
     """Main application entry point"""
     logger.info("Starting Multi-Agent Educational Platform")
-    os.environ["GOOGLE_API_KEY"] = "" # <--- REPLACE
     try:
         # TODO: Initialize ObjectBox database
         # TODO: Initialize PocketFlow components
@@ -103,8 +204,13 @@ def main():
 
         logger.info("Platform initialization complete")
 
-        # Start Flask server
-        app.run(host='0.0.0.0', port=8000, debug=True)
+        # Start the HTTP server
+        if os.environ.get("FLASK_DEBUG") == "1":
+            # Local development only: Werkzeug's reloader and interactive debugger
+            app.run(host='0.0.0.0', port=8000, debug=True)
+        else:
+            options = dict(get_config()["server"], post_fork=_restart_log_listener)
+            run_server(app, options)
 
     except KeyboardInterrupt:
         logger.info("Shutting down platform...")
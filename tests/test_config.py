@@ -15,6 +15,7 @@ def test_get_config():
     assert "mcp" in config
     assert "analytics" in config
     assert "google_calendar" in config
+    assert "server" in config
     assert "logging" in config
 
 
@@ -44,4 +45,24 @@ def test_pocketflow_config():
     
     assert "max_retries" in pocketflow_config
     assert "retry_delay" in pocketflow_config
-    assert "shared_store_size" in pocketflow_config
\ No newline at end of file
+    assert "shared_store_size" in pocketflow_config
+
+
+def test_server_config():
+    """Test HTTP server configuration"""
+    config = get_config()
+    server_config = config["server"]
+    
+    assert "bind" in server_config
+    assert server_config["workers"] >= 1
+    assert server_config["threads"] >= 1
+
+def test_get_config_is_cached_and_read_only():
+    """Test configuration is built once and cannot be mutated by callers"""
+    config = get_config()
+
+    assert get_config() is config
+    with pytest.raises(TypeError):
+        config["objectbox"] = {}
+    with pytest.raises(TypeError):
+        config["objectbox"]["max_readers"] = 1
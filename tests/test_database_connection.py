@@ -11,13 +11,16 @@ Tests cover:
 
 import pytest
 import tempfile
+import threading
+import time
 import shutil
 from unittest.mock import patch, MagicMock
 
 from src.database.connection import (
     DatabaseConfig, ObjectBoxManager, initialize_database, get_database,
     close_database, database_transaction, DatabaseHealthCheck,
-    ensure_database_initialized, reset_database, db_manager
+    ensure_database_initialized, reset_database, db_manager, bulk_put,
+    bulk, ReadTxPool, paged_find, iter_all
 )
 
 
@@ -32,6 +35,7 @@ class TestDatabaseConfig:
         assert config.max_db_size_in_kb == 1024 * 1024  # 1GB
         assert config.max_readers == 126
         assert config.debug_flags == 0
+        assert 1 <= config.pool_size <= config.max_readers
     
     def test_custom_config(self):
         """Test custom configuration values."""
@@ -65,6 +69,24 @@ class TestDatabaseConfig:
         }
         
         assert config_dict == expected
+    
+    def test_to_dict_optional_options(self):
+        """Test optional Store options are only included when set."""
+        config = DatabaseConfig(
+            file_mode=0o600, max_data_size_in_kb=2048, read_only=True, model_json_file="model.json"
+        )
+        
+        config_dict = config.to_dict()
+        
+        assert config_dict["file_mode"] == 0o600
+        assert config_dict["max_data_size_in_kb"] == 2048
+        assert config_dict["read_only"] is True
+        assert config_dict["model_json_file"] == "model.json"
+    
+    def test_pool_size_cannot_exceed_max_readers(self):
+        """Test the read pool is validated against the Store's reader limit."""
+        with pytest.raises(ValueError, match="cannot exceed max_readers"):
+            DatabaseConfig(max_readers=4, pool_size=8)
 
 
 class TestObjectBoxManager:
@@ -152,13 +174,57 @@ class TestObjectBoxManager:
         store = manager.get_store()
         assert store == mock_store_instance
     
-    def test_get_store_not_initialized(self):
-        """Test getting store when not initialized."""
+    @patch('src.database.connection.Store')
+    @patch('os.makedirs')
+    def test_get_store_not_initialized(self, mock_makedirs, mock_store):
+        """Test getting store lazily initializes it with defaults."""
+        mock_store_instance = MagicMock()
+        mock_store.return_value = mock_store_instance
+        
+        manager = ObjectBoxManager()
+        assert not manager.is_initialized()
+        
+        store = manager.get_store()
+        
+        assert store == mock_store_instance
+        mock_makedirs.assert_called_once_with("data/objectbox", exist_ok=True)
+        assert manager.get_store() is store
+        mock_store.assert_called_once()
+    
+    @patch('src.database.connection.Store')
+    @patch('os.makedirs')
+    def test_get_store_lazy_init_failure(self, mock_makedirs, mock_store):
+        """Test lazy initialization failure surfaces as RuntimeError."""
+        mock_store.side_effect = Exception("Store creation failed")
+        
         manager = ObjectBoxManager()
         
-        with pytest.raises(RuntimeError, match="ObjectBox Store not initialized"):
+        with pytest.raises(RuntimeError, match="Database initialization failed"):
             manager.get_store()
     
+    @patch('src.database.connection.Store')
+    @patch('os.makedirs')
+    def test_concurrent_get_store_opens_once(self, mock_makedirs, mock_store):
+        """Test concurrent first calls to get_store open a single Store."""
+        def slow_store(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+        mock_store.side_effect = slow_store
+        
+        stores = []
+        threads = [
+            threading.Thread(target=lambda: stores.append(ObjectBoxManager().get_store()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        mock_store.assert_called_once()
+        assert len(stores) == 8
+        assert all(store is stores[0] for store in stores)
+    
     @patch('src.database.connection.Store')
     @patch('src.database.connection.Builder')
     @patch('os.makedirs')
@@ -255,6 +321,51 @@ class TestDatabaseFunctions:
             store.some_operation()
         
         mock_store.some_operation.assert_called_once()
+        mock_store.write_tx.return_value.__exit__.assert_called_once()
+    
+    @patch('src.database.connection.get_database')
+    def test_database_transaction_write_mode(self, mock_get_database):
+        """Test write mode runs inside an explicit write transaction."""
+        mock_store = MagicMock()
+        mock_get_database.return_value = mock_store
+        
+        with database_transaction("write") as store:
+            assert store == mock_store
+        
+        mock_store.write_tx.assert_called_once()
+        mock_store.write_tx.return_value.__enter__.assert_called_once()
+    
+    @patch('src.database.connection.get_database')
+    def test_bulk_one_transaction_per_chunk(self, mock_get_database):
+        """Test bulk applies fn to each item inside one write transaction per chunk."""
+        mock_store = MagicMock()
+        mock_get_database.return_value = mock_store
+        seen = []
+        
+        processed = bulk(seen.append, range(5), chunk=2)
+        
+        assert processed == 5
+        assert seen == [0, 1, 2, 3, 4]
+        assert mock_store.write_tx.call_count == 3
+    
+    def test_database_transaction_invalid_mode(self):
+        """Test an unknown transaction mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown transaction mode"):
+            with database_transaction("append"):
+                pass
+    
+    def test_read_tx_pool_reuses_thread_transaction(self):
+        """Test nested read_tx blocks share one read transaction."""
+        mock_store = MagicMock()
+        pool = ReadTxPool(mock_store, pool_size=2)
+        
+        with pool.read_tx() as outer:
+            with pool.read_tx() as inner:
+                assert inner is outer is mock_store
+        with pool.read_tx():
+            pass
+        
+        assert mock_store.read_tx.call_count == 2
     
     @patch('src.database.connection.get_database')
     def test_database_transaction_failure(self, mock_get_database):
@@ -266,6 +377,42 @@ class TestDatabaseFunctions:
             with database_transaction():
                 raise ValueError("Test error")
     
+    def test_bulk_put_batches(self):
+        """Test bulk_put writes one transaction per batch."""
+        mock_box = MagicMock()
+        objects = list(range(25))
+        
+        written = bulk_put(mock_box, iter(objects), batch_size=10)
+        
+        assert written == 25
+        assert mock_box._store.write_tx.call_count == 3
+        assert [c.args[0] for c in mock_box.put.call_args_list] == [
+            objects[0:10], objects[10:20], objects[20:25]
+        ]
+    
+    def test_bulk_put_invalid_batch_size(self):
+        """Test bulk_put rejects a non-positive batch size."""
+        with pytest.raises(ValueError, match="batch_size must be positive"):
+            bulk_put(MagicMock(), [1], batch_size=0)
+    
+    def test_paged_find(self):
+        """Test paged_find applies and then resets offset and limit."""
+        mock_query = MagicMock()
+        mock_query.find.return_value = ["a", "b"]
+        
+        assert paged_find(mock_query, page=2, page_size=10) == ["a", "b"]
+        
+        assert [c.args[0] for c in mock_query.offset.call_args_list] == [20, 0]
+        assert [c.args[0] for c in mock_query.limit.call_args_list] == [10, 0]
+    
+    def test_iter_all_stops_after_short_page(self):
+        """Test iter_all walks pages until one comes back short."""
+        mock_query = MagicMock()
+        mock_query.find.side_effect = [[1, 2], [3, 4], [5]]
+        
+        assert list(iter_all(mock_query, page_size=2)) == [1, 2, 3, 4, 5]
+        assert mock_query.find.call_count == 3
+    
     @patch('src.database.connection.ObjectBoxManager.is_initialized')
     @patch('src.database.connection.initialize_database')
     def test_ensure_database_initialized_not_initialized(self, mock_initialize, mock_is_initialized):
@@ -301,6 +448,10 @@ class TestDatabaseFunctions:
 class TestDatabaseHealthCheck:
     """Test cases for DatabaseHealthCheck utility."""
     
+    def setup_method(self):
+        """Reset the stats cache before each test."""
+        DatabaseHealthCheck._stats_cache = None
+    
     @patch('src.database.connection.get_database')
     def test_check_connection_healthy(self, mock_get_database):
         """Test healthy database connection check."""
@@ -356,4 +507,34 @@ class TestDatabaseHealthCheck:
         assert stats["is_initialized"] is False
         assert stats["connection_healthy"] is False
         assert "error" in stats
-        assert stats["error"] == "Stats error"
\ No newline at end of file
+        assert stats["error"] == "Stats error"
+    
+    @patch('src.database.connection.get_database')
+    @patch('src.database.connection.db_manager')
+    def test_get_database_stats_cached(self, mock_manager, mock_get_database):
+        """Test stats are measured once per TTL and health comes from the same size call."""
+        mock_store = MagicMock()
+        mock_store.size.return_value = 42
+        mock_get_database.return_value = mock_store
+        mock_manager.get_config.return_value = None
+        
+        first = DatabaseHealthCheck.get_database_stats()
+        second = DatabaseHealthCheck.get_database_stats()
+        
+        assert first == second
+        assert first["connection_healthy"] is True
+        mock_store.size.assert_called_once()
+    
+    @patch('src.database.connection.get_database')
+    @patch('src.database.connection.db_manager')
+    def test_get_database_stats_unhealthy_store(self, mock_manager, mock_get_database):
+        """Test a failing size call marks the connection unhealthy."""
+        mock_store = MagicMock()
+        mock_store.size.side_effect = Exception("Disk error")
+        mock_get_database.return_value = mock_store
+        mock_manager.get_config.return_value = None
+        
+        stats = DatabaseHealthCheck.get_database_stats()
+        
+        assert stats["connection_healthy"] is False
+        assert stats["database_size"] == 0
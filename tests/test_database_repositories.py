@@ -0,0 +1,209 @@
+"""
+Unit tests for the ObjectBox repositories.
+
+Tests run against a real Store in a temporary directory and cover:
+- Batched CRUD operations
+- Cached queries rebound with new parameter values
+- Filtered vector similarity search
+"""
+
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.database.connection import DatabaseConfig, initialize_database, close_database
+from src.database.models import (
+    Student, Interaction, LearningProgress, CurriculumContent, EMBEDDING_DIMENSIONS
+)
+from src.database.repositories import (
+    StudentRepository, InteractionRepository, LearningProgressRepository,
+    CurriculumContentRepository
+)
+
+
+# Versioned ObjectBox model; tests sync a copy so they never write to the source tree
+MODEL_JSON_FILE = Path(__file__).parent.parent / "src" / "database" / "objectbox-model.json"
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path):
+    """Open a fresh Store for each test and close it afterwards."""
+    close_database()
+    model_json_file = tmp_path / "objectbox-model.json"
+    shutil.copyfile(MODEL_JSON_FILE, model_json_file)
+    store = initialize_database(
+        DatabaseConfig(str(tmp_path / "objectbox"), model_json_file=str(model_json_file))
+    )
+    yield store
+    close_database()
+
+
+def _embedding(axis: int) -> np.ndarray:
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+    vector[axis] = 1.0
+    return vector
+
+
+class TestBaseRepository:
+    """Test cases for the shared CRUD operations."""
+
+    def test_get_many(self):
+        """Test get_many keeps the order of the IDs and returns None for missing ones."""
+        repository = StudentRepository()
+        students = repository.create_many([Student(name=name) for name in ("a", "b", "c")])
+        ids = [student.id for student in students]
+
+        found = repository.get_many([ids[2], 999, ids[0]])
+
+        assert [student.name if student else None for student in found] == ["c", None, "a"]
+
+    def test_bulk_upsert(self):
+        """Test bulk_upsert inserts new entities and updates existing ones across chunks."""
+        repository = StudentRepository()
+        students = [Student(name=f"s{i}") for i in range(5)]
+
+        assert repository.bulk_upsert(students, chunk=2) == 5
+        assert all(student.id for student in students)
+
+        students[0].name = "renamed"
+        repository.bulk_upsert(students[:1])
+
+        assert repository.count() == 5
+        assert repository.get_by_id(students[0].id).name == "renamed"
+
+    def test_bulk_upsert_invalid_chunk(self):
+        """Test bulk_upsert rejects a non-positive chunk size."""
+        with pytest.raises(ValueError, match="chunk must be positive"):
+            StudentRepository().bulk_upsert([Student()], chunk=0)
+
+    def test_delete_many(self):
+        """Test delete_many removes every given entity."""
+        repository = StudentRepository()
+        students = repository.create_many([Student(name=name) for name in ("a", "b", "c")])
+
+        assert repository.delete_many([students[0].id, students[2].id]) is True
+
+        assert [student.name for student in repository.get_all()] == ["b"]
+
+
+class TestCachedQueries:
+    """Test cases for queries that are built once and rebound per call."""
+
+    def test_find_by_email_rebinds(self):
+        """Test find_by_email answers each email from the same cached query."""
+        repository = StudentRepository()
+        repository.create_many([
+            Student(name="Ann", email="ann@example.com"),
+            Student(name="Bob", email="bob@example.com"),
+        ])
+
+        assert repository.find_by_email("ann@example.com").name == "Ann"
+        query = repository._queries.email
+        assert repository.find_by_email("bob@example.com").name == "Bob"
+        assert repository.find_by_email("nobody@example.com") is None
+        assert repository._queries.email is query
+
+    def test_find_by_student_id_rebinds(self):
+        """Test interaction lookups by student share one rebound query."""
+        repository = InteractionRepository()
+        repository.create_many([
+            Interaction(student_id=1, session_id="s1"),
+            Interaction(student_id=1, session_id="s2"),
+            Interaction(student_id=2, session_id="s1"),
+        ])
+
+        assert len(repository.find_by_student_id(1)) == 2
+        assert len(repository.find_by_student_id(2)) == 1
+        assert len(repository.find_ids_by_student_id(1)) == 2
+        assert len(list(repository.iter_by_student_id(1))) == 2
+        assert len(repository.find_by_session_id("s1")) == 2
+        assert len(repository.find_by_session_id("s2")) == 1
+
+    def test_find_multimodal_interactions(self):
+        """Test multimodal lookups with and without a student filter."""
+        repository = InteractionRepository()
+        repository.create_many([
+            Interaction(student_id=1, input_type="voice"),
+            Interaction(student_id=1, input_type="text"),
+            Interaction(student_id=2, input_type="image"),
+        ])
+
+        assert len(repository.find_multimodal_interactions()) == 2
+        assert [i.input_type for i in repository.find_multimodal_interactions(1)] == ["voice"]
+        assert [i.input_type for i in repository.find_multimodal_interactions(2)] == ["image"]
+
+    def test_learning_progress_queries(self):
+        """Test subject and completion lookups for learning progress."""
+        repository = LearningProgressRepository()
+        repository.create_many([
+            LearningProgress(student_id=1, subject="math", completion_percentage=100.0),
+            LearningProgress(student_id=1, subject="art", completion_percentage=40.0),
+            LearningProgress(student_id=2, subject="math", completion_percentage=100.0),
+        ])
+
+        assert len(repository.find_by_subject("math")) == 2
+        assert len(repository.find_by_subject("math", student_id=2)) == 1
+        assert len(repository.find_by_subject("art", student_id=2)) == 0
+        assert [p.subject for p in repository.find_completed_topics(1)] == ["math"]
+
+    def test_find_by_difficulty_level_rebinds(self):
+        """Test both aliased difficulty bounds are rebound on each call."""
+        repository = CurriculumContentRepository()
+        repository.create_many([CurriculumContent(title=str(level), difficulty_level=level) for level in range(1, 11)])
+
+        assert [c.difficulty_level for c in repository.find_by_difficulty_level(3, 5)] == [3, 4, 5]
+        assert [c.difficulty_level for c in repository.find_by_difficulty_level(9, 10)] == [9, 10]
+        assert repository.find_by_difficulty_level(11, 20) == []
+
+    def test_find_advanced_content(self):
+        """Test advanced content lookups with and without a subject filter."""
+        repository = CurriculumContentRepository()
+        repository.create_many([
+            CurriculumContent(subject="math", difficulty_level=8),
+            CurriculumContent(subject="math", difficulty_level=7),
+            CurriculumContent(subject="art", difficulty_level=9),
+        ])
+
+        assert sorted(c.difficulty_level for c in repository.find_advanced_content()) == [8, 9]
+        assert [c.subject for c in repository.find_advanced_content("math")] == ["math"]
+        assert [c.subject for c in repository.find_advanced_content("art")] == ["art"]
+
+    def test_cached_queries_are_per_thread(self):
+        """Test each thread builds its own query, so bindings never cross threads."""
+        repository = CurriculumContentRepository()
+        repository.create_many([CurriculumContent(subject="math"), CurriculumContent(subject="art")])
+        repository.find_by_subject("math")
+        queries = []
+
+        thread = threading.Thread(
+            target=lambda: (repository.find_by_subject("art"), queries.append(repository._queries.subject))
+        )
+        thread.start()
+        thread.join()
+
+        assert queries and queries[0] is not repository._queries.subject
+
+
+class TestSimilaritySearch:
+    """Test cases for nearest-neighbor curriculum search."""
+
+    def test_find_similar_content_with_filters(self):
+        """Test filtered searches return the nearest matching content, closest first."""
+        repository = CurriculumContentRepository()
+        contents = [
+            CurriculumContent(title=f"c{axis}", subject="math" if axis % 2 else "art",
+                              difficulty_level=axis, vector_embedding=_embedding(axis))
+            for axis in range(10)
+        ]
+        repository.create_many(contents)
+        query_vector = _embedding(0) + 0.5 * _embedding(1) + 0.25 * _embedding(2) + 0.125 * _embedding(3)
+
+        assert [c.title for c in repository.find_similar_content(query_vector, max_results=2)] == ["c0", "c1"]
+        assert [c.title for c in repository.find_similar_content(query_vector, max_results=2, subject="math")] == ["c1", "c3"]
+
+        scored = repository.find_similar_content_with_scores(query_vector, max_results=2, difficulty_range=(2, 5))
+        assert [c.title for c, _ in scored] == ["c2", "c3"]
+        assert scored[0][1] <= scored[1][1]
@@ -0,0 +1,83 @@
+"""
+Unit tests for the RAG ingestion pipeline.
+
+Tests cover:
+- Chunk bookkeeping when a vector store write fails
+- Semantic query cache hits
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("langchain_objectbox")
+
+from langchain_core.documents import Document
+
+from src.agents.history.RAG import EnhancedRAG, SemanticQueryCache
+
+
+@pytest.fixture
+def rag():
+    """RAG pipeline without persistence, writing to a mock vector store."""
+    rag = EnhancedRAG(embedding_cache_path=None, vector_store_path=None, embed_workers=1)
+    rag.vector_store = MagicMock()
+    return rag
+
+
+class TestIngest:
+    """Test cases for EnhancedRAG ingestion."""
+
+    def test_failed_write_is_retried(self, rag):
+        """Test chunks of a failed batch are written when the documents are added again."""
+        documents = [
+            Document(page_content="first chunk", metadata={"source": "a"}),
+            Document(page_content="second chunk", metadata={"source": "b"}),
+        ]
+        rag.vector_store.add_documents.side_effect = [RuntimeError("write failed"), ["id1", "id2"]]
+
+        with pytest.raises(RuntimeError, match="write failed"):
+            rag.add_documents(documents)
+        assert rag.chunk_sources == {}
+
+        rag.add_documents(documents)
+
+        retried = rag.vector_store.add_documents.call_args_list[1].args[0]
+        assert [chunk.page_content for chunk in retried] == ["first chunk", "second chunk"]
+        assert sorted(rag.chunk_ids.values()) == ["id1", "id2"]
+        assert sorted(sources[0]["source"] for sources in rag.chunk_sources.values()) == ["a", "b"]
+
+    def test_duplicate_chunks_are_written_once(self, rag):
+        """Test repeated content is embedded once and its sources are all recorded."""
+        documents = [
+            Document(page_content="same chunk", metadata={"source": "a"}),
+            Document(page_content="same chunk", metadata={"source": "b"}),
+        ]
+        rag.vector_store.add_documents.return_value = ["id1"]
+
+        rag.add_documents(documents)
+
+        assert rag.vector_store.add_documents.call_count == 1
+        assert [source["source"] for source in next(iter(rag.chunk_sources.values()))] == ["a", "b"]
+
+
+class TestSemanticQueryCache:
+    """Test cases for SemanticQueryCache."""
+
+    def test_hits_are_independent_copies(self):
+        """Test each hit is a copy carrying the new question, so callers cannot corrupt the cache."""
+        cache = SemanticQueryCache()
+        context = [Document(page_content="chunk")]
+        response = {"input": "What is ObjectBox?", "context": context, "answer": "A database."}
+        cache.add([1.0, 0.0, 0.0], response)
+        response["answer"] = "changed by the chain's caller"
+
+        hit = cache.get([1.0, 0.01, 0.0], "What's ObjectBox?")
+        assert hit == {"input": "What's ObjectBox?", "context": context, "answer": "A database."}
+        hit.pop("answer")
+        hit["context"].clear()
+
+        again = cache.get([1.0, 0.0, 0.0], "What is ObjectBox?")
+        assert again["answer"] == "A database."
+        assert again["context"] == context
+        assert cache.get([0.0, 1.0, 0.0]) is None
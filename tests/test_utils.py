@@ -3,13 +3,21 @@ Tests for utility functions
 """
 import pytest
 import asyncio
+import threading
+import time
+from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
+from types import MappingProxyType
 from utils import (
     get_current_timestamp,
+    get_current_epoch,
     safe_dict_get,
     retry_async,
     validate_input_type,
-    sanitize_string
+    sanitize_string,
+    check_code,
+    call_llm,
+    call_llm_many
 )
 
 
@@ -20,6 +28,30 @@ def test_get_current_timestamp():
     assert timestamp.tzinfo == timezone.utc
 
 
+def test_get_current_epoch():
+    """Test epoch time matches the UTC timestamp"""
+    before = get_current_timestamp().timestamp()
+    epoch = get_current_epoch()
+    assert isinstance(epoch, float)
+    assert before <= epoch <= get_current_timestamp().timestamp()
+
+
+def test_get_current_timestamp_coalesced():
+    """Test coalesced timestamps within one event-loop millisecond"""
+    async def run_test():
+        loop = asyncio.get_running_loop()
+        loop.time = lambda: 5.0
+        first = get_current_timestamp(coalesce=True)
+        assert get_current_timestamp(coalesce=True) is first
+        
+        loop.time = lambda: 5.002
+        assert get_current_timestamp(coalesce=True) is not first
+    
+    asyncio.run(run_test())
+    # Outside an event loop there is nothing to coalesce with
+    assert get_current_timestamp(coalesce=True).tzinfo == timezone.utc
+
+
 def test_safe_dict_get():
     """Test safe dictionary access"""
     data = {"key1": "value1", "key2": None}
@@ -28,6 +60,8 @@ def test_safe_dict_get():
     assert safe_dict_get(data, "key2") is None
     assert safe_dict_get(data, "missing") is None
     assert safe_dict_get(data, "missing", "default") == "default"
+    assert safe_dict_get(data, "missing", default=0) == 0
+    assert safe_dict_get(MappingProxyType(data), "key1") == "value1"
 
 
 def test_retry_async_success():
@@ -65,6 +99,79 @@ def test_retry_async_failure():
     asyncio.run(run_test())
 
 
+def test_retry_async_no_retries():
+    """Test retry function with retries disabled"""
+    call_count = 0
+    
+    async def fail_func():
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Test error")
+    
+    async def run_test():
+        with patch("utils.asyncio.sleep") as mock_sleep:
+            with pytest.raises(ValueError):
+                await retry_async(fail_func, max_retries=0)
+            mock_sleep.assert_not_called()
+        
+        assert call_count == 1
+    
+    asyncio.run(run_test())
+
+
+def test_retry_async_backoff_schedule():
+    """Test retry delays with and without jitter"""
+    async def fail_func():
+        raise ValueError("Test error")
+    
+    async def run_test(delay=1.0, **kwargs):
+        delays = []
+        
+        async def record_sleep(seconds):
+            delays.append(seconds)
+        
+        with patch("utils.asyncio.sleep", record_sleep):
+            with pytest.raises(ValueError):
+                await retry_async(fail_func, max_retries=5, delay=delay, max_delay=6.0, **kwargs)
+        return delays
+    
+    assert asyncio.run(run_test(jitter=False)) == [1.0, 2.0, 4.0, 6.0, 6.0]
+    assert asyncio.run(run_test(jitter=False, delay=1e-4))[:3] == [0, 0, 0]
+    
+    delays = asyncio.run(run_test())
+    # The first wait is jittered too, so callers failing together spread out
+    assert 1.0 <= delays[0] <= 2.0
+    assert asyncio.run(run_test())[0] != delays[0]
+    for previous, current in zip(delays, delays[1:]):
+        assert 1.0 <= current <= min(6.0, previous * 2.0)
+
+
+def test_retry_async_total_timeout():
+    """Test retries stop once the overall budget is spent"""
+    call_count = 0
+    
+    async def fail_func():
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Test error")
+    
+    async def run_test():
+        delays = []
+        
+        async def record_sleep(seconds):
+            delays.append(seconds)
+        
+        clock = iter([0.0, 0.0, 1.5, 3.0])
+        with patch("utils.asyncio.sleep", record_sleep), \
+                patch("utils.time.monotonic", lambda: next(clock)):
+            with pytest.raises(ValueError):
+                await retry_async(fail_func, max_retries=5, delay=1.0, jitter=False, total_timeout=2.0)
+        return delays
+    
+    assert asyncio.run(run_test()) == [1.0, 0.5]
+    assert call_count == 3
+
+
 def test_validate_input_type():
     """Test input type validation"""
     assert validate_input_type("hello", "text") is True
@@ -88,4 +195,59 @@ def test_sanitize_string():
     assert sanitize_string("hello\x00world") == "helloworld"
     assert sanitize_string("hello\nworld") == "hello\nworld"
     assert sanitize_string("a" * 1001, max_length=10) == "aaaaaaaaaa..."
-    assert sanitize_string(123) == ""
\ No newline at end of file
+    assert sanitize_string("\x00" * 100 + "abc", max_length=3) == "abc"
+    assert sanitize_string("\x00" * 100 + "abcd", max_length=3) == "abc..."
+    assert sanitize_string(123) == ""
+
+def test_check_code():
+    """Test generated code syntax validation"""
+    assert check_code("results = box.query().build().find()") is True
+    assert check_code("def broken(:") is False
+    assert check_code("return 1") is False
+    assert check_code("break") is False
+    assert check_code("yield 2") is False
+    assert check_code("x = '\x00'") is False
+    assert check_code("x = 1\n" * 10000) is True
+
+
+def test_call_llm_reuses_model_client():
+    """Test LLM calls share one cached client per model name"""
+    client = MagicMock()
+    client.generate.return_value = {"response": "answer"}
+    
+    # A model name no other test uses, so its client is not cached yet
+    with patch("utils._ollama_client", return_value=client) as mock_client:
+        assert call_llm("first", model="reuse-test-model") == "answer"
+        assert call_llm("second", model="reuse-test-model") == "answer"
+    
+    mock_client.assert_called_once()
+    client.generate.assert_called_with(model="reuse-test-model", prompt="second")
+    
+    # A callable model is used as is
+    assert call_llm("prompt", model=str.upper) == "PROMPT"
+
+
+def test_call_llm_many_bounded_concurrency():
+    """Test batched LLM calls keep order and respect the concurrency limit"""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    
+    def generate(model, prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return {"response": prompt.upper()}
+    
+    client = MagicMock()
+    client.generate.side_effect = generate
+    prompts = [f"p{i}" for i in range(10)]
+    with patch("utils._ollama_client", return_value=client):
+        results = asyncio.run(call_llm_many(prompts, model="batch-test-model", max_concurrent=3))
+    
+    assert results == [p.upper() for p in prompts]
+    assert 1 < peak <= 3
@@ -1,22 +1,101 @@
 """
 Utility functions for the Multi-Agent Educational Platform
 """
+from __future__ import annotations
+
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+import random
+import re
+import time
+import weakref
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Mapping, Optional
 from datetime import datetime, timezone
 from google.genai import types
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "get_current_timestamp",
+    "get_current_epoch",
+    "safe_dict_get",
+    "retry_async",
+    "validate_input_type",
+    "sanitize_string",
+    "call_llm",
+    "call_llm_async",
+    "call_llm_many",
+    "check_code",
+    "call_agent_async",
+]
+
+# Generated code longer than this is validated without being cached, which
+# keeps the validation cache's memory bounded
+_MAX_CACHED_CODE_LENGTH = 16 * 1024
+
+# str.translate table deleting control characters other than \t, \n and \r
+_SANITIZE_TABLE = {c: None for c in range(32) if c not in (9, 10, 13)}
+
+# sanitize_string first cleans only this many characters per max_length of an
+# oversized input; the rest is only read if the prefix was mostly control chars
+_SANITIZE_WINDOW_FACTOR = 4
+
+
+_UTC = timezone.utc
+
+# Retry delays shorter than this just yield to the event loop instead of
+# arming a timer
+_MIN_TIMED_SLEEP = 1e-3
+
+# Last coalesced timestamp per event loop: (loop clock in whole ms, timestamp)
+_loop_timestamps: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple] = weakref.WeakKeyDictionary()
+
+
+def get_current_timestamp(coalesce: bool = False) -> datetime:
+    """
+    Get current UTC timestamp
+
+    Args:
+        coalesce: Inside a running event loop, return the same timestamp to
+            every caller within one millisecond of the loop's clock instead
+            of reading the wall clock each time
+
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    if not coalesce:
+        return datetime.now(_UTC)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return datetime.now(_UTC)
+
+    bucket = int(loop.time() * 1000)
+    cached = _loop_timestamps.get(loop)
+    if cached is not None and cached[0] == bucket:
+        return cached[1]
+    timestamp = datetime.now(_UTC)
+    _loop_timestamps[loop] = (bucket, timestamp)
+    return timestamp
+
+
+def get_current_epoch() -> float:
+    """
+    Get current time as seconds since the Unix epoch
 
-def get_current_timestamp() -> datetime:
-    """Get current UTC timestamp"""
-    return datetime.now(timezone.utc)
+    Cheaper than get_current_timestamp for callers that only compare or
+    store times, since no datetime is built.
 
+    Returns:
+        Seconds since the epoch
+    """
+    return time.time()
 
-def safe_dict_get(data: Dict[str, Any], key: str, default: Any = None) -> Any:
-    """Safely get value from dictionary with default"""
+
+def safe_dict_get(data: Mapping[str, Any], key: str, default: Any = None) -> Any:
+    """Safely get value from dictionary (or any mapping) with default"""
     return data.get(key, default)
 
 
@@ -25,17 +104,29 @@ async def retry_async(
     max_retries: int = 3,
     delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    max_delay: float = 60.0,
+    jitter: bool = True,
+    total_timeout: Optional[float] = None
 ) -> Any:
     """
     Retry an async function with exponential backoff
 
+    With jitter (the default) every delay, the first included, is drawn at
+    random between `delay` and `backoff_factor` times the previous delay
+    ("decorrelated jitter"; the first is drawn up to `backoff_factor * delay`),
+    so callers that failed together do not all retry at the same moment.
+
     Args:
         func: Async function to retry
         max_retries: Maximum number of retry attempts
         delay: Initial delay between retries
         backoff_factor: Multiplier for delay on each retry
         exceptions: Tuple of exceptions to catch and retry on
+        max_delay: Upper bound for any single delay
+        jitter: Randomize delays; False gives the plain exponential schedule
+        total_timeout: Overall budget in seconds; delays are cut short so no
+            retry starts after it runs out
 
     Returns:
         Result of the function call
@@ -43,23 +134,59 @@ async def retry_async(
     Raises:
         Last exception if all retries fail
     """
-    last_exception = None
     current_delay = delay
+    deadline = time.monotonic() + total_timeout if total_timeout is not None else None
 
-    for attempt in range(max_retries + 1):
+    for attempt in range(max_retries):
         try:
             return await func()
         except exceptions as e:
-            last_exception = e
-            if attempt == max_retries:
-                logger.error(f"Function failed after {max_retries} retries: {e}")
-                break
+            if jitter:
+                current_delay = min(max_delay, random.uniform(delay, current_delay * backoff_factor))
+            elif attempt:
+                current_delay = min(max_delay, current_delay * backoff_factor)
+            wait = current_delay
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error("Function failed after %d attempts, retry budget exhausted: %s", attempt + 1, e)
+                    raise
+                wait = min(wait, remaining)
+            logger.warning("Attempt %d failed: %s. Retrying in %ss...", attempt + 1, e, wait)
+            await asyncio.sleep(wait if wait >= _MIN_TIMED_SLEEP else 0)
+
+    # Final attempt: nothing left to schedule, its exception propagates as is
+    try:
+        return await func()
+    except exceptions as e:
+        logger.error("Function failed after %d retries: %s", max_retries, e)
+        raise
+
+
+_NON_WHITESPACE = re.compile(r"\S")
+
 
-            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {current_delay}s...")
-            await asyncio.sleep(current_delay)
-            current_delay *= backoff_factor
+def _is_text(input_data: Any) -> bool:
+    # Stops at the first non-whitespace character instead of copying via strip()
+    return isinstance(input_data, str) and _NON_WHITESPACE.search(input_data) is not None
 
-    raise last_exception
+
+def _is_present(input_data: Any) -> bool:
+    return input_data is not None
+
+
+def _reject(input_data: Any) -> bool:
+    return False
+
+
+# Read-only so callers cannot register validators behind the module's back
+_INPUT_VALIDATORS: Mapping[str, Callable[[Any], bool]] = MappingProxyType({
+    "text": _is_text,
+    # TODO: Implement voice data validation
+    "voice": _is_present,
+    # TODO: Implement image data validation
+    "image": _is_present,
+})
 
 
 def validate_input_type(input_data: Any, input_type: str) -> bool:
@@ -73,22 +200,16 @@ def validate_input_type(input_data: Any, input_type: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if input_type == "text":
-        return isinstance(input_data, str) and len(input_data.strip()) > 0
-    elif input_type == "voice":
-        # TODO: Implement voice data validation
-        return input_data is not None
-    elif input_type == "image":
-        # TODO: Implement image data validation
-        return input_data is not None
-    else:
-        return False
+    return _INPUT_VALIDATORS.get(input_type, _reject)(input_data)
 
 
 def sanitize_string(text: str, max_length: int = 1000) -> str:
     """
     Sanitize string input for safe storage and processing
 
+    Oversized inputs are cleaned from a prefix of the text, so the cost
+    follows max_length rather than the size of the input.
+
     Args:
         text: Input text to sanitize
         max_length: Maximum allowed length
@@ -100,7 +221,14 @@ def sanitize_string(text: str, max_length: int = 1000) -> str:
         return ""
 
     # Remove null bytes and control characters
-    sanitized = "".join(char for char in text if ord(char) >= 32 or char in "\n\r\t")
+    window = max_length * _SANITIZE_WINDOW_FACTOR
+    if len(text) > window:
+        sanitized = text[:window].translate(_SANITIZE_TABLE)
+        if len(sanitized) <= max_length:
+            # Mostly control characters; the cut could change the result
+            sanitized = text.translate(_SANITIZE_TABLE)
+    else:
+        sanitized = text.translate(_SANITIZE_TABLE)
 
     # Truncate if too long
     if len(sanitized) > max_length:
@@ -108,26 +236,113 @@ def sanitize_string(text: str, max_length: int = 1000) -> str:
 
     return sanitized.strip()
 
+@lru_cache(maxsize=1)
+def _ollama_client():
+    """Process-wide Ollama client; its HTTP connections are kept alive and shared"""
+    import ollama
+    return ollama.Client()
+
+
+@lru_cache(maxsize=None)
+def _get_model(name: str) -> Callable[[str], str]:
+    """Get the cached prompt -> completion callable for an Ollama model"""
+    client = _ollama_client()
+
+    def generate(prompt: str) -> str:
+        return client.generate(model=name, prompt=prompt)["response"]
+
+    return generate
+
+
 def call_llm(prompt, model="gemma3n"):
     """
     Call a language model with a given prompt
 
     Args:
         prompt: Input prompt for the language model
-        model: Language model to use
+        model: Ollama model name, or a callable taking the prompt and
+            returning the completion
 
     Returns:
         Response from the language model
     """
     try:
-        response = "Hi"
-        return response
+        client = _get_model(model) if isinstance(model, str) else model
+        return client(prompt)
     except Exception as e:
         logger.error(f"LLM call failed: {e}")
         raise
 
-def check_code(code: str):
-    return
+async def call_llm_async(prompt, model="gemma3n"):
+    """
+    Call a language model without blocking the event loop
+
+    Runs call_llm in a worker thread.
+
+    Args:
+        prompt: Input prompt for the language model
+        model: Ollama model name or callable, as for call_llm
+
+    Returns:
+        Response from the language model
+    """
+    return await asyncio.to_thread(call_llm, prompt, model)
+
+
+async def call_llm_many(prompts: Iterable[str], model="gemma3n", max_concurrent: int = 8) -> List[Any]:
+    """
+    Call a language model with several prompts concurrently
+
+    At most max_concurrent calls are in flight at once, so a large batch does
+    not flood the model server.
+
+    Args:
+        prompts: Input prompts
+        model: Ollama model name or callable, as for call_llm
+        max_concurrent: Maximum number of simultaneous calls
+
+    Returns:
+        Responses in the order of the prompts
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def call(prompt):
+        async with semaphore:
+            return await call_llm_async(prompt, model)
+
+    return await asyncio.gather(*(call(prompt) for prompt in prompts))
+
+@lru_cache(maxsize=1024)
+def _validate_cached(code: str) -> bool:
+    return _parses(code)
+
+
+def _parses(code: str) -> bool:
+    # compile(), unlike ast.parse(), also rejects statements that are only
+    # valid inside a function or loop (return, yield, break at module level)
+    try:
+        compile(code, "<check>", "exec", dont_inherit=True)
+        return True
+    except (SyntaxError, ValueError):
+        return False
+
+
+def check_code(code: str) -> bool:
+    """
+    Check that generated Python code is syntactically valid
+
+    LLMs often regenerate identical snippets, so results are cached by code
+    string and repeated validations skip the compiler.
+
+    Args:
+        code: Source code to validate
+
+    Returns:
+        True if the code compiles, False otherwise
+    """
+    if len(code) > _MAX_CACHED_CODE_LENGTH:
+        return _parses(code)
+    return _validate_cached(code)
 
 async def call_agent_async(query: str, runner, user_id, session_id):
   """Sends a query to the agent and prints the final response."""